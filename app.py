@@ -1,14 +1,47 @@
+import importlib
+import logging
+import sys
+import time
+
+_SCRIPT_START = time.perf_counter()
+
 import streamlit as st
 from streamlit_option_menu import option_menu
-from eda import run_eda
-from home import run_home
-from ml import run_ml
-from snagdam import run_snagdam
+
+import metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ✅ 메뉴별 페이지 (모듈, 실행 함수) - 메뉴를 처음 선택할 때 import
+PAGES = {
+    "🏠 홈": ("home", "run_home"),
+    "🔍 질병 예측": ("eda", "run_eda"),
+    "💬 상담 챗봇": ("snagdam", "run_snagdam"),
+    "📊 앱개발 과정": ("ml", "run_ml"),
+}
 
 
+# ✅ 프로세스 단위 시작 시간 기록 (페이지 로드 시간, 첫 렌더링 시간)
+@st.cache_resource
+def startup_report():
+    return {"pages": {}, "first_render": None}
+
+
+def load_page(menu):
+    module_name, func_name = PAGES[menu]
+    if module_name not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        elapsed = time.perf_counter() - start
+        startup_report()["pages"][module_name] = elapsed
+        logger.info("✅ 페이지 '%s' 로드: %.3fs", module_name, elapsed)
+    return getattr(sys.modules[module_name], func_name)
 
 
 def main():
+    metrics.start_exporters()
+
     # ✅ Streamlit Option Menu 사용
     with st.sidebar:
         st.markdown("<h2 style='text-align: center; color: #007bff; font-weight: bold;'>📌 건강 예측 AI</h2>", unsafe_allow_html=True)
@@ -38,14 +71,12 @@ def main():
         )
 
     # ✅ 선택된 메뉴 실행
-    if menu == "🏠 홈":
-        run_home()
-    elif menu == "🔍 질병 예측":
-        run_eda()
-    elif menu == "💬 상담 챗봇":
-        run_snagdam()
-    elif menu == "📊 앱개발 과정":
-        run_ml()
+    load_page(menu)()
+
+    report = startup_report()
+    if report["first_render"] is None:
+        report["first_render"] = time.perf_counter() - _SCRIPT_START
+        logger.info("✅ 첫 화면 렌더링: %.3fs (%s)", report["first_render"], menu)
     
 # ✅ 실행
 if __name__ == "__main__":
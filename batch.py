@@ -0,0 +1,108 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_io import MODEL_PATH, load_predictor
+from risk import DISEASES, FEATURES, STATUS_LABELS, adjust_by_age_array, disease_probabilities, preprocess, risk_levels
+
+CHUNK_SIZE = 50_000
+MISSING_LABEL = "⚪ 입력값 누락"
+
+
+# ✅ 모델 로드 (Streamlit 없이 사용, 네이티브 포맷 우선)
+def load_model(path=MODEL_PATH):
+    return load_predictor(path)
+
+
+# ✅ 입력 배열 (N, 6) + 나이 (N,) → 나이 보정된 위험 확률 (N, 3)
+def score_array(model, features, ages):
+    probs = disease_probabilities(model.predict(features))
+    return adjust_by_age_array(ages, probs)
+
+
+# ✅ DataFrame 한 덩어리 예측 (입력 컬럼은 그대로 두고 결과 컬럼 추가)
+def score_frame(model, df):
+    missing = [col for col in FEATURES + ["age"] if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {missing}")
+
+    # 빈 값(NaN) 이 있는 행은 예측하지 않고 결과를 비워 "입력값 누락" 으로 표시
+    # 범위를 벗어난 검진값은 입력 폼 범위로 맞춰서 예측
+    inputs = df[FEATURES + ["age"]].to_numpy(dtype=np.float64)
+    valid = np.isfinite(inputs).all(axis=1)
+    probs = np.full((len(df), len(DISEASES)), np.nan)
+    bmi = np.full(len(df), np.nan)
+    if valid.any():
+        features, bmi[valid] = preprocess(inputs[valid, :-1], clip=True)
+        probs[valid] = score_array(model, features, inputs[valid, -1])
+    labels = np.where(valid[:, None], STATUS_LABELS[risk_levels(np.nan_to_num(probs))], MISSING_LABEL)
+
+    out = df.copy()
+    out["BMI"] = bmi.round(2)
+    for i, disease in enumerate(DISEASES):
+        out[disease] = probs[:, i]
+        out[f"{disease}_상태"] = labels[:, i]
+    return out
+
+
+# ✅ CSV / Parquet 파일을 chunk 단위로 읽기
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+# ✅ 입력 파일 → 결과 파일 (chunk 단위로 바로 기록, 전체를 메모리에 올리지 않음)
+def score_file(input_path, output_path, model=None, chunk_size=CHUNK_SIZE):
+    if model is None:
+        model = load_model()
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            result = score_frame(model, chunk)
+
+            if output_path.endswith(".parquet"):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                if writer is None:
+                    table = pa.Table.from_pandas(result, preserve_index=False)
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(result, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+            else:
+                result.to_csv(output_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+
+            rows += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="건강 위험 배치 예측")
+    parser.add_argument("input", help="입력 파일 (.csv / .parquet)")
+    parser.add_argument("output", help="결과 파일 (.csv / .parquet)")
+    parser.add_argument("--model", default=MODEL_PATH, help="모델 파일 경로 (같은 이름의 .ubj 파일이 있으면 우선 사용)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="한 번에 예측할 행 수")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = score_file(args.input, args.output, load_model(args.model), args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {rows}건 예측 완료 ({elapsed:.2f}s, {rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
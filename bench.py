@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+
+from model_io import MODEL_PATH, NATIVE_SUFFIX, TABLE_SUFFIX, TREE_SUFFIX, load_predictor
+from risk import DISEASES, FEATURE_RANGES, FEATURES, adjust_by_age_array, body_mass_index, clip_predictions, health_status_array
+
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+
+SAMPLE_MESSAGES = [
+    "혈압을 낮추는 방법 알려줘",
+    "당뇨병 환자에게 좋은 식단은?",
+    "요즘 스트레스 때문에 잠을 잘 못 자요",
+    "오늘 날씨 어때?",
+    "주식 투자 어떻게 해?",
+    "유산소 운동은 일주일에 몇 번이 적당한가요?",
+]
+
+
+# ✅ 함수 반복 실행 → 실행 시간 통계 (마이크로초)
+def measure(func, repeat=100, warmup=3):
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return {
+        "repeat": repeat,
+        "min_us": times[0],
+        "median_us": statistics.median(times),
+        "p95_us": times[min(len(times) - 1, int(len(times) * 0.95))],
+        "mean_us": statistics.fmean(times),
+    }
+
+
+# ✅ 입력 범위 안의 랜덤 입력 (N, 6) + 나이 (N,)
+def random_inputs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    features = np.column_stack([
+        rng.integers(low, high + 1, rows) for low, high in (FEATURE_RANGES[feature] for feature in FEATURES)
+    ])
+    return features, rng.integers(10, 101, rows)
+
+
+# ✅ 사용 가능한 모델 백엔드 (파일이 있는 것만)
+def available_backends(model_path=MODEL_PATH):
+    backends = {"pickle": lambda: load_predictor(model_path, backend="pickle")}
+    if os.path.exists(model_path + NATIVE_SUFFIX):
+        backends["native"] = lambda: load_predictor(model_path, backend="auto")
+    if os.path.exists(model_path + TREE_SUFFIX):
+        backends["tree"] = lambda: load_predictor(model_path, backend="tree")
+    if os.path.exists(model_path + TABLE_SUFFIX):
+        backends["table"] = lambda: load_predictor(model_path, backend="table")
+    return backends
+
+
+def bench_model(model_path=MODEL_PATH, batch_sizes=BATCH_SIZES):
+    results = {}
+    for name, load in available_backends(model_path).items():
+        start = time.perf_counter()
+        predictor = load()
+        result = {"load_s": time.perf_counter() - start}
+
+        features, _ = random_inputs(1)
+        result["single_row"] = measure(lambda: predictor.predict(features), repeat=500)
+
+        result["batch"] = {}
+        for rows in batch_sizes:
+            features, _ = random_inputs(rows)
+            stats = measure(lambda: predictor.predict(features), repeat=max(1, min(50, 100_000 // rows)), warmup=1)
+            stats["rows_per_s"] = rows / (stats["median_us"] / 1e6)
+            result["batch"][str(rows)] = stats
+        results[name] = result
+    return results
+
+
+def bench_postprocess(rows=10_000):
+    from eda import adjust_by_age, get_health_status
+
+    _, ages = random_inputs(rows)
+    probs = np.random.default_rng(1).uniform(0, 100, (rows, len(DISEASES)))
+
+    def dict_version():
+        for age, row in zip(ages, probs):
+            prob_dict = adjust_by_age(age, dict(zip(DISEASES, row)))
+            for disease in DISEASES:
+                get_health_status(prob_dict[disease])
+
+    def array_version():
+        health_status_array(adjust_by_age_array(ages, clip_predictions(probs)))
+
+    return {
+        "rows": rows,
+        "dict": measure(dict_version, repeat=5, warmup=1),
+        "array": measure(array_version, repeat=50),
+    }
+
+
+def bench_keywords(messages=100_000):
+    from snagdam import is_health_related
+
+    texts = (SAMPLE_MESSAGES * (messages // len(SAMPLE_MESSAGES) + 1))[:messages]
+    stats = measure(lambda: [is_health_related(text) for text in texts], repeat=5, warmup=1)
+    stats["messages_per_s"] = messages / (stats["median_us"] / 1e6)
+    return stats
+
+
+def bench_figure():
+    from eda import build_comparison_figure
+
+    prob_dict = {"고혈압": 19.52, "당뇨병": 11.34, "고지혈증": 24.22}
+    build = lambda: build_comparison_figure("남성", 70, body_mass_index(70, 170), 120, 80, prob_dict)
+    fig = build()
+    return {
+        "build": measure(build, repeat=50),
+        "to_json": measure(fig.to_json, repeat=50),
+    }
+
+
+def run_benchmarks(model_path=MODEL_PATH, batch_sizes=BATCH_SIZES):
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "model": bench_model(model_path, batch_sizes),
+        "postprocess": bench_postprocess(),
+        "is_health_related": bench_keywords(),
+        "comparison_figure": bench_figure(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예측 / 챗봇 경로 벤치마크")
+    parser.add_argument("--model", default=MODEL_PATH, help="모델 파일 경로")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument("--max-rows", type=int, default=max(BATCH_SIZES), help="배치 크기 상한")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.model, [rows for rows in BATCH_SIZES if rows <= args.max_rows])
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ 저장 완료: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
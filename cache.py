@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# ✅ 크기 제한(LRU) + 만료 시간(TTL) 캐시, 여러 세션(스레드)에서 공유 가능
+class TTLCache:
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[1] is None or item[1] > time.monotonic()):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    # ✅ 만료되지 않은 항목 (key, value, 남은 TTL 초 또는 None) 목록 - LRU 순서는 바꾸지 않음
+    def entries(self):
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, None if expires is None else expires - now)
+                for key, (value, expires) in self._data.items()
+                if expires is None or expires > now
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,192 @@
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from cache import TTLCache
+from keywords import HEALTH_MATCHER, KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get("HEALTH_CHAT_CACHE_PATH", ".cache/chat_responses.jsonl")
+SIMILARITY = os.environ.get("HEALTH_CHAT_CACHE_SIMILARITY")
+SIMILARITY = float(SIMILARITY) if SIMILARITY else None
+
+# ✅ 질문 정규화 규칙 (조사 / 어미 / 요청 표현 제거, 같은 뜻의 단어 통일)
+PARTICLES = sorted([
+    "에서는", "으로는", "에게서", "이랑", "하고", "에서", "에게", "으로", "까지", "부터", "처럼", "보다",
+    "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "와", "과", "만",
+], key=len, reverse=True)
+STOPWORDS = {
+    "알려줘", "알려주세요", "알려", "줘", "주세요", "해줘", "해주세요", "좀", "요",
+    "뭐야", "뭔가요", "무엇", "무엇인가요", "있나요", "있을까요",
+}
+SYNONYMS = {"방법": "법"}
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_question(text):
+    words = []
+    for word in _PUNCTUATION.sub(" ", text.lower()).split():
+        if word in STOPWORDS:
+            continue
+        for particle in PARTICLES:
+            if word.endswith(particle) and len(word) - len(particle) >= 2:
+                word = word[:-len(particle)]
+                break
+        words.append(SYNONYMS.get(word, word))
+    return " ".join(words)
+
+
+# ✅ 글자 n-gram 집합 (공백 제외)
+def char_ngrams(text, n=2):
+    text = text.replace(" ", "")
+    if len(text) < n:
+        return frozenset([text])
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def similarity(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+# ✅ 뜻을 뒤집는 부정 / 반대 표현 ("안 좋은", "나쁜", "높이는" / "낮추는" 등)
+# 유사도 적중은 두 질문의 건강 키워드와 이 표현들이 모두 같을 때만 허용
+CONTRAST_TERMS = [
+    "않", "없", "나쁜", "나쁘", "안좋", "안 좋", "금지", "피해", "피할", "해로", "위험",
+    "높", "낮", "올리", "내리", "늘리", "줄이", "증가", "감소", "과다", "부족", "많이", "적게",
+]
+NEGATION_WORDS = {"안", "못", "덜"}
+_CONTRAST_MATCHER = KeywordMatcher(CONTRAST_TERMS)
+
+
+# ✅ 정규화 질문 → (글자 n-gram, 건강 키워드 + 부정 / 반대 표현)
+def question_features(key):
+    terms = set(HEALTH_MATCHER.find(key)) | set(_CONTRAST_MATCHER.find(key))
+    terms.update(word for word in key.split() if word in NEGATION_WORDS)
+    return char_ngrams(key), frozenset(terms)
+
+
+# ✅ 챗봇 응답 캐시
+# - 기본은 정규화된 질문이 같을 때만 적중 (threshold=None, HEALTH_CHAT_CACHE_SIMILARITY 로 변경)
+# - threshold 를 주면 건강 키워드 / 부정·반대 표현이 모두 같은 질문 중 글자 n-gram 유사도가 threshold 이상인 가장 비슷한 질문 사용
+#   ("고혈압" / "저혈압", "좋은" / "안 좋은" 처럼 한 글자로 뜻이 바뀌는 질문은 적중하지 않음)
+# - LRU + TTL 로 크기 제한, 로컬 파일(JSON Lines)에 이어 쓰기만 해 재시작 후에도 유지
+#   (여러 프로세스가 같은 파일을 써도 파일 잠금으로 서로의 항목을 덮어쓰지 않음, 줄이 maxsize 의 2배를 넘으면 정리)
+class ChatResponseCache:
+    def __init__(self, path=CACHE_PATH, maxsize=1000, ttl=7 * 24 * 3600, threshold=SIMILARITY):
+        self.path = path
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.similar_hits = 0
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, question):
+        key = normalize_question(question)
+        item = self.cache.get(key)
+        if item is not None:
+            return item[0]
+        if self.threshold is None:
+            return None
+
+        grams, terms = question_features(key)
+        best_key, best_score = None, self.threshold
+        for other, (_, other_grams, other_terms), _ in self.cache.entries():
+            if other_terms != terms:
+                continue
+            score = similarity(grams, other_grams)
+            if score >= best_score:
+                best_key, best_score = other, score
+
+        item = self.cache.get(best_key) if best_key is not None else None
+        if item is None:
+            return None
+        self.similar_hits += 1
+        return item[0]
+
+    def put(self, question, answer):
+        key = normalize_question(question)
+        ttl = self.cache.ttl
+        self.cache.set(key, (answer, *question_features(key)))
+        self._append({"key": key, "answer": answer, "expires_at": None if ttl is None else time.time() + ttl})
+
+    # 유사도 적중은 정확히 일치하는 키 조회(miss) 뒤 가장 비슷한 키 조회(hit)로 세어지므로 miss 에서 뺌
+    def stats(self):
+        stats = self.cache.stats()
+        misses = stats["misses"] - self.similar_hits
+        total = stats["hits"] + misses
+        return {
+            **stats,
+            "misses": misses,
+            "hit_rate": stats["hits"] / total if total else 0.0,
+            "similar_hits": self.similar_hits,
+        }
+
+    # 파일의 항목 → ({key: 마지막 항목} (추가 순서), 줄 수)
+    def _read_entries(self):
+        entries, lines = {}, 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 쓰는 도중 종료된 줄
+                entries.pop(entry["key"], None)
+                entries[entry["key"]] = entry
+        return entries, lines
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            entries, self._lines = self._read_entries()
+        except OSError:
+            logger.exception("⚠️ 챗봇 응답 캐시를 읽지 못했습니다: %s", self.path)
+            return
+
+        now = time.time()
+        for entry in entries.values():
+            remaining = None if entry["expires_at"] is None else entry["expires_at"] - now
+            if remaining is None or remaining > 0:
+                self.cache.set(entry["key"], (entry["answer"], *question_features(entry["key"])), ttl=remaining)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, entry):
+        if not self.path:
+            return
+        with self._file_lock():
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._lines += 1
+            if self._lines > 2 * self.maxsize:
+                self._compact()
+
+    # 파일을 다시 읽어 (다른 프로세스가 추가한 항목 포함) 키마다 마지막 항목만, 만료되지 않은 최근 maxsize 개를 임시 파일에 쓴 뒤 교체
+    def _compact(self):
+        now = time.time()
+        entries = [
+            entry for entry in self._read_entries()[0].values()
+            if entry["expires_at"] is None or entry["expires_at"] > now
+        ][-self.maxsize:]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        os.replace(tmp_path, self.path)
+        self._lines = len(entries)
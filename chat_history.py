@@ -0,0 +1,151 @@
+import json
+import os
+import time
+import uuid
+import weakref
+from collections import deque
+
+from keywords import HEALTH_MATCHER
+
+HISTORY_DIR = os.environ.get("HEALTH_CHAT_HISTORY_DIR", ".cache/chat_history")
+WINDOW = int(os.environ.get("HEALTH_CHAT_WINDOW", "20"))
+CONTEXT_TURNS = int(os.environ.get("HEALTH_CHAT_CONTEXT_TURNS", "0"))
+CONTEXT_TOKENS = int(os.environ.get("HEALTH_CHAT_CONTEXT_TOKENS", "600"))
+MAX_AGE = float(os.environ.get("HEALTH_CHAT_HISTORY_MAX_AGE", str(24 * 3600)))
+MAX_SUMMARY_TOPICS = 10
+
+USER = "user"
+ASSISTANT = "assistant"
+_LABELS = {USER: "사용자", ASSISTANT: "상담 AI"}
+
+
+# ✅ 토큰 수 어림값 (한글은 글자당 토큰 1개 이상 → 글자 수로 넉넉하게 계산)
+def estimate_tokens(text):
+    return len(text)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ✅ max_age 초 동안 바뀌지 않은 세션 파일 삭제 (비정상 종료로 남은 파일 정리)
+def sweep(directory=HISTORY_DIR, max_age=MAX_AGE):
+    if not directory or not max_age or not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# ✅ 세션별 대화 기록
+# - 메시지는 (role, content) 튜플로 최근 window 개만 메모리에 유지
+# - 밀려난 메시지는 세션 파일(JSON Lines)에 추가하고, 줄 시작 위치만 기억 → 필요할 때 페이지 단위로 읽음
+# - 밀려난 사용자 질문의 건강 키워드를 모아 짧은 요약으로 유지
+# - 세션 파일 보관: 세션이 끝나 기록 객체가 정리되거나 프로세스가 종료되면 삭제,
+#   새 세션을 만들 때 max_age 초 동안 쓰이지 않은 파일도 삭제 (그보다 오래된 페이지는 더 보기에서 빠짐)
+class ChatHistory:
+    def __init__(self, window=WINDOW, directory=HISTORY_DIR, session_id=None, max_age=MAX_AGE):
+        self.window = window
+        self.directory = directory
+        self.session_id = session_id or uuid.uuid4().hex
+        self.recent = deque()
+        self.topics = {}
+        self._offsets = []
+        if self.path:
+            sweep(directory, max_age)
+            weakref.finalize(self, _remove, self.path)
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f"{self.session_id}.jsonl") if self.directory else None
+
+    @property
+    def archived(self):
+        return len(self._offsets)
+
+    def __len__(self):
+        return self.archived + len(self.recent)
+
+    def append(self, role, content):
+        self.recent.append((role, content))
+        overflow = []
+        while len(self.recent) > self.window:
+            overflow.append(self.recent.popleft())
+        if overflow:
+            self._archive(overflow)
+
+    def _archive(self, messages):
+        for role, content in messages:
+            if role == USER:
+                for keyword in HEALTH_MATCHER.find(content):
+                    self.topics.pop(keyword, None)
+                    self.topics[keyword] = None
+        while len(self.topics) > MAX_SUMMARY_TOPICS:
+            del self.topics[next(iter(self.topics))]
+
+        if not self.path:
+            self._offsets.extend([None] * len(messages))
+            return
+        if self._offsets and not os.path.exists(self.path):
+            self._offsets = [None] * len(self._offsets)  # 오래돼 삭제된 파일
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "ab") as f:
+            for role, content in messages:
+                self._offsets.append(f.tell())
+                f.write(json.dumps([role, content], ensure_ascii=False).encode("utf-8") + b"\n")
+
+    # ✅ 밀려난 메시지 한 페이지 (page 0 = 가장 최근에 밀려난 메시지들, 오래된 순으로 정렬)
+    def page(self, page, page_size=20):
+        end = self.archived - page * page_size
+        start = max(0, end - page_size)
+        if end <= 0 or not self.path or not os.path.exists(self.path):
+            return []
+        # 삭제된 파일에 있던 메시지(None)는 항상 앞쪽에 있으므로 건너뜀
+        while start < end and self._offsets[start] is None:
+            start += 1
+        if start == end:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start])
+            return [tuple(json.loads(f.readline())) for _ in range(end - start)]
+
+    def summary(self):
+        if not self.archived:
+            return ""
+        topics = ", ".join(reversed(list(self.topics)))
+        return f"이전 대화 {self.archived}개" + (f" (주제: {topics})" if topics else "")
+
+    # ✅ 프롬프트에 넣을 최근 대화 (최근 turns 개 질문/답변, 토큰 예산 안에서 최신 메시지부터 채움)
+    def context(self, turns=CONTEXT_TURNS, max_tokens=CONTEXT_TOKENS):
+        if turns <= 0:
+            return ""
+        lines = []
+        budget = max_tokens
+        for role, content in list(self.recent)[-2 * turns:][::-1]:
+            line = f"{_LABELS.get(role, role)}: {content}"
+            cost = estimate_tokens(line)
+            if cost > budget:
+                break
+            lines.append(line)
+            budget -= cost
+        summary = self.summary()
+        if summary and estimate_tokens(summary) <= budget:
+            lines.append(summary)
+        return "\n".join(reversed(lines))
+
+    def clear(self):
+        self.recent.clear()
+        self.topics.clear()
+        self._offsets.clear()
+        if self.path:
+            _remove(self.path)
@@ -1,65 +1,143 @@
-import joblib
+import functools
+import os
+
 import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 
-# ✅ AI 모델 로드
+from cache import TTLCache
+from metrics import register_collector, timed
+from model_io import load_predictor
+from risk import (
+    AGE_BINS, AGE_FACTORS, DISEASES, STATUS_ADVICE, STATUS_LABELS, STATUS_TEXTS,
+    adjust_by_age_array, disease_probabilities, health_status_array, preprocess, risk_levels,
+    summarize_health_array,
+)
+from risk_store import RiskStore, to_frame
+
+# ✅ AI 모델 로드 (페이지를 처음 열 때 한 번만, 네이티브 포맷 우선)
 @st.cache_resource
 def load_model():
-    return joblib.load("regressor_xg")
-
-model = load_model()
+    return load_predictor()
 
-# ✅ 나이에 따른 가중치 적용 함수
+# ✅ 사용자별 위험도 기록 저장소 (프로세스 단위 공유)
+@st.cache_resource
+def risk_store():
+    return RiskStore()
+
+# ✅ 로그인한 사용자 ID (Streamlit 로그인 - secrets.toml 의 [auth] 설정이 없거나 로그인하지 않았으면 None)
+# 위험도 기록은 로그인한 본인 것만 저장 / 조회 (다른 사람의 ID 를 입력해 기록을 볼 수 없도록)
+def signed_in_user():
+    try:
+        if not st.user.is_logged_in:
+            return None
+    except (AttributeError, KeyError):
+        return None
+    return st.user.get("email") or st.user.get("sub")
+
+def auth_configured():
+    try:
+        return "auth" in st.secrets
+    except FileNotFoundError:
+        return False
+
+# ✅ 예측 결과 캐시 (프로세스 단위로 모든 세션이 공유)
+@st.cache_resource
+def prediction_cache():
+    cache = TTLCache(maxsize=4096, ttl=3600)
+    register_collector(lambda: {f"prediction_cache_{key}": value for key, value in cache.stats().items()})
+    return cache
+
+# ✅ 입력값 → (나이 보정된 위험 확률 (1, 3), BMI), 같은 입력 조합은 캐시에서 바로 반환
+# BMI 는 전처리에서 계산한 값을 그대로 비교 차트에 사용
+def predict_risk(model, age, systolic_bp, diastolic_bp, weight, height, smoke, alco):
+    key = tuple(int(v) for v in (age, systolic_bp, diastolic_bp, weight, height, smoke, alco))
+    cache = prediction_cache()
+
+    result = cache.get(key)
+    if result is None:
+        features, bmi = preprocess(key[1:])
+        with timed("model_predict"):
+            probs = disease_probabilities(model.predict(features))
+        probs = adjust_by_age_array([key[0]], probs)
+        probs.setflags(write=False)
+        result = probs, float(bmi[0])
+        cache.set(key, result)
+    return result
+
+# ✅ 나이에 따른 가중치 적용 함수 (dict 버전, 배열 버전은 risk.adjust_by_age_array)
 def adjust_by_age(age, probabilities):
-    age_factors = {"고혈압": 0, "비만": 0, "당뇨병": 0, "고지혈증": 0}
-    
-    if age < 30:
-        age_factors = {"고혈압": 0, "비만": 5, "당뇨병": 0, "고지혈증": 0}
-    elif age < 40:
-        age_factors = {"고혈압": 5, "비만": 10, "당뇨병": 5, "고지혈증": 5}
-    elif age < 50:
-        age_factors = {"고혈압": 10, "비만": 10, "당뇨병": 10, "고지혈증": 6}
-    elif age < 60:
-        age_factors = {"고혈압": 25, "비만": 5, "당뇨병": 30, "고지혈증": 10}
-    else:
-        age_factors = {"고혈압": 25, "비만": 5, "당뇨병": 30, "고지혈증": 10}
-    
+    age_factors = AGE_FACTORS[np.digitize(age, AGE_BINS)]
+
     for disease in probabilities:
-        probabilities[disease] += age_factors[disease]
+        probabilities[disease] += age_factors[DISEASES.index(disease)]
         probabilities[disease] = min(probabilities[disease], 100)
-    
+
     return probabilities
 
 # ✅ 위험 수준 및 건강 조치 반환 함수
 def get_health_status(probability):
-    if probability <= 20:
-        return "🟢 매우 안전", "✅ 건강 유지!", "위험이 거의 없습니다. 현재 건강을 잘 유지하세요!"
-    elif probability <= 40:
-        return "🟢 안전", "👍 건강 양호", "위험이 낮습니다. 균형 잡힌 식사를 유지하세요."
-    elif probability <= 60:
-        return "🟡 주의", "⚠️ 주의 필요", "위험이 증가 중입니다. 생활 습관 개선이 필요합니다."
-    elif probability <= 80:
-        return "🟠 위험", "🚨 건강 경고!", "위험이 높습니다. 정기 검진과 건강 관리가 필요합니다."
-    else:
-        return "🔴 위급", "⛔ 즉시 조치 필요!", "위험이 매우 높습니다! 병원 진료를 권장합니다."
+    level = int(risk_levels(probability))
+    return str(STATUS_LABELS[level]), str(STATUS_TEXTS[level]), str(STATUS_ADVICE[level])
 
 def summarize_health(prob_dict):
-    avg_risk = np.mean(list(prob_dict.values()))
-    
-    if avg_risk <= 20:
-        return "✅ 전반적으로 건강 상태가 양호합니다! 좋은 생활 습관을 계속 유지하세요."
-    elif avg_risk <= 40:
-        return "👍 현재 건강 상태는 안정적입니다. 하지만 꾸준한 건강 관리가 필요합니다."
-    elif avg_risk <= 60:
-        return "⚠️ 건강 상태에 주의가 필요합니다. 생활 습관 개선을 고려해보세요."
-    elif avg_risk <= 80:
-        return "🚨 건강 위험 수준이 높아지고 있습니다. 적극적인 건강 관리가 필요합니다!"
+    return str(summarize_health_array(np.array([list(prob_dict.values())]))[0])
+
+# ✅ 대한민국 평균 데이터 (비교 차트 항목 순서)
+CHART_CATEGORIES = ["몸무게 (kg)", "사용자 BMI", "수축기 혈압", "이완기 혈압", "고혈압 위험", "당뇨병 위험", "고지혈증 위험"]
+AVG_VALUES = {
+    "남성": [74, 24.8, 120, 78, 30, 15, 25],
+    "여성": [62, 24.2, 115, 75, 28, 12, 20],
+}
+AVG_LABEL = "대한민국 평균"
+USER_LABEL = "유저 입력값"
+
+# ✅ 차트 표시 방식 (plotly: 기존 Plotly 차트 / native: Streamlit 기본 막대 차트, 더 가벼움)
+CHART_MODE = os.environ.get("HEALTH_CHART_MODE", "plotly")
+
+# ✅ 사용자 입력값 → 비교 차트 값 (CHART_CATEGORIES 순서, bmi 는 predict_risk 결과)
+def comparison_values(weight, bmi, systolic_bp, diastolic_bp, prob_dict):
+    return [weight, round(bmi, 2), systolic_bp, diastolic_bp, prob_dict["고혈압"], prob_dict["당뇨병"], prob_dict["고지혈증"]]
+
+# ✅ 성별별 차트 틀 (레이아웃 + 평균 막대 + 빈 사용자 막대) - 프로세스당 한 번만 만들고 dict 로 보관
+@functools.lru_cache(maxsize=None)
+def comparison_template(gender):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=CHART_CATEGORIES, y=AVG_VALUES[gender], name=AVG_LABEL, marker_color="blue", opacity=0.7))
+    fig.add_trace(go.Bar(x=CHART_CATEGORIES, y=[], name=USER_LABEL, marker_color="red", opacity=0.7))
+    fig.update_layout(
+        title="📊 평균값과 입력값 비교",
+        xaxis_title="건강 지표", yaxis_title="수치",
+        barmode="group", template="plotly_white",
+        margin=dict(l=40, r=40, t=60, b=40), height=600
+    )
+    return fig.to_plotly_json()
+
+# ✅ 평균 vs. 입력값 비교 차트 생성 (Plotly) - 틀을 복사해 사용자 막대 값만 바꾸고, 이미 검증된 틀이므로 재검증 생략
+def build_comparison_figure(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict):
+    template = comparison_template(gender)
+    avg_trace, user_trace = template["data"]
+    user_trace = {**user_trace, "y": comparison_values(weight, bmi, systolic_bp, diastolic_bp, prob_dict)}
+    return go.Figure({"data": [avg_trace, user_trace], "layout": template["layout"]}, _validate=False)
+
+# ✅ 가벼운 표시 방식용 데이터 (항목 x [평균, 사용자])
+def comparison_frame(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict):
+    return pd.DataFrame(
+        {AVG_LABEL: AVG_VALUES[gender], USER_LABEL: comparison_values(weight, bmi, systolic_bp, diastolic_bp, prob_dict)},
+        index=CHART_CATEGORIES,
+    )
+
+def render_comparison_chart(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict, mode=CHART_MODE):
+    if mode == "native":
+        frame = comparison_frame(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict)
+        st.bar_chart(frame, color=["#1f3fff", "#ff3030"], sort=False, stack=False, height=600)
     else:
-        return "⛔ 건강 위험이 매우 높습니다! 즉시 의료 전문가와 상담하세요."
+        st.plotly_chart(build_comparison_figure(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict))
 
 def run_eda():
+    model = load_model()
+
     st.title("🩺 건강 예측 AI")
     st.markdown("📌 **건강 정보를 입력하면 AI가 질병 발생 확률을 예측합니다.**")
 
@@ -76,29 +154,32 @@ def run_eda():
 
         submit = st.form_submit_button("🔮 예측하기")
 
+    user_id = signed_in_user()
+    if user_id:
+        st.caption(f"🪪 {user_id} 님의 예측 기록을 저장하고 위험도 추이를 보여드립니다.")
+    elif auth_configured():
+        st.button("🔑 로그인하면 예측 기록을 저장하고 위험도 추이를 볼 수 있습니다", on_click=st.login)
 
 
 
     if submit:
-        input_data = np.array([[ 
-            systolic_bp, diastolic_bp, weight, height, smoke, alco
-        ]])
+        predicted_probs, bmi = predict_risk(model, age, systolic_bp, diastolic_bp, weight, height, smoke, alco)
 
-        predicted_probs = model.predict(input_data)
-        predicted_probs = np.clip(np.round(predicted_probs, 2), 0, 100)
+        if user_id:
+            risk_store().record(user_id, [systolic_bp, diastolic_bp, weight, height, smoke, alco], age, predicted_probs)
 
-        diseases = ["고혈압", "비만", "당뇨병","고지혈증"]
-        prob_dict = {diseases[i]: predicted_probs[0, i] for i in range(len(diseases))}
-        prob_dict = adjust_by_age(age, prob_dict)
+        diseases = DISEASES
+        prob_dict = dict(zip(diseases, predicted_probs[0]))
+        statuses, _, advices = health_status_array(predicted_probs[0])
 
         
         st.markdown("## 🏥 건강 종합 진단")
-        st.info(summarize_health(prob_dict))
+        st.info(summarize_health_array(predicted_probs)[0])
 
         col1, col2 = st.columns(2)
 
         for i, disease in enumerate(diseases):
-            status, status_text, advice = get_health_status(prob_dict[disease])
+            status, advice = statuses[i], advices[i]
 
             with col1 if i % 2 == 0 else col2:
                 st.subheader(f"📌 {disease}")
@@ -137,37 +218,6 @@ def run_eda():
 
 ## ------------------------------------------------------------------------
                 
-                # ✅ 대한민국 평균 데이터
-        avg_values = {
-            "남성": {"몸무게": 74, "BMI": 24.8, "수축기 혈압": 120, "이완기 혈압": 78, "고혈압": 30, "당뇨병": 15, "고지혈증": 25},
-            "여성": {"몸무게": 62, "BMI": 24.2, "수축기 혈압": 115, "이완기 혈압": 75, "고혈압": 28, "당뇨병": 12, "고지혈증": 20}
-        }
-        avg_data = avg_values[gender]
-
-        # ✅ 사용자 BMI 계산 (체중 / 키(m)^2)
-        BMI = round(weight / ((height / 100) ** 2), 2)
-
-        # ✅ 사용자 입력값 정리
-        user_data = {
-            "몸무게 (kg)": weight,
-            "사용자 BMI": BMI,
-            "수축기 혈압": systolic_bp,
-            "이완기 혈압": diastolic_bp,
-            "고혈압 위험": prob_dict["고혈압"],
-            "당뇨병 위험": prob_dict["당뇨병"],
-            "고지혈증 위험": prob_dict["고지혈증"]
-        }
-
-        avg_chart = {
-            "몸무게 (kg)": avg_data["몸무게"],
-            "대한민국 평균 BMI": avg_data["BMI"],
-            "수축기 혈압": avg_data["수축기 혈압"],
-            "이완기 혈압": avg_data["이완기 혈압"],
-            "고혈압 위험": avg_data["고혈압"],
-            "당뇨병 위험": avg_data["당뇨병"],
-            "고지혈증 위험": avg_data["고지혈증"]
-        }
-
         # ✅ 평균 비교 차트 (Plotly)
         st.markdown("---")
         st.markdown("### 📊 **평균 vs. 입력값 비교**")
@@ -178,17 +228,8 @@ def run_eda():
             "이를 통해 자신의 건강 상태가 평균과 비교해 어느 정도 차이가 있는지 확인할 수 있습니다."
         )
 
-        categories = list(user_data.keys())
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=categories, y=list(avg_chart.values()), name="대한민국 평균", marker_color="blue", opacity=0.7))
-        fig.add_trace(go.Bar(x=categories, y=list(user_data.values()), name="유저 입력값", marker_color="red", opacity=0.7))
-        fig.update_layout(
-            title="📊 평균값과 입력값 비교",
-            xaxis_title="건강 지표", yaxis_title="수치",
-            barmode="group", template="plotly_white",
-            margin=dict(l=40, r=40, t=60, b=40), height=600
-        )
-        st.plotly_chart(fig)
+        with timed("chart_render"):
+            render_comparison_chart(gender, weight, bmi, systolic_bp, diastolic_bp, prob_dict)
 
         # ✅ 건강 지표 설명
         st.markdown("### 📌 **건강 지표 설명**")
@@ -198,3 +239,13 @@ def run_eda():
             "- **고혈압, 당뇨병, 고지혈증 위험**: 각 질병에 대한 AI 예측 확률(%)로, 높을수록 위험 수준 증가.\n"
             "- **대한민국 평균값**: 한국 성인 평균 건강 지표 (참고용)."
         )
+
+        # ✅ 위험도 추이 (로그인한 경우, 본인 기록만)
+        if user_id:
+            st.markdown("### 📈 **위험도 추이**")
+            with timed("risk_history"):
+                history = to_frame(risk_store().query(user_id))
+            if len(history) > 1:
+                st.line_chart(history[DISEASES])
+            else:
+                st.caption("예측 기록이 2회 이상 쌓이면 위험도 추이를 보여드립니다.")
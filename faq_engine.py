@@ -0,0 +1,62 @@
+import json
+import os
+
+from chat_cache import char_ngrams, normalize_question
+from keywords import HEALTH_MATCHER
+
+FAQ_PATH = os.environ.get("HEALTH_FAQ_PATH", "health_faq.json")
+FALLBACK_ANSWER = (
+    "죄송합니다. 해당 질문에 대한 답변을 찾지 못했습니다. "
+    "증상이 있거나 걱정되는 점이 있다면 가까운 병원에서 전문의와 상담해 보시기 바랍니다."
+)
+QUESTION_MARKER = "질문:"
+
+
+# ✅ 프롬프트 마지막의 "질문: ..." 부분만 꺼냄 (없으면 프롬프트 전체)
+def extract_question(prompt):
+    index = prompt.rfind(QUESTION_MARKER)
+    return prompt[index + len(QUESTION_MARKER):].strip() if index >= 0 else prompt.strip()
+
+
+def _overlap(a, b):
+    return len(a & b) / min(len(a), len(b)) if a and b else 0.0
+
+
+# ✅ 로컬 건강 FAQ 검색 응답기 (네트워크 / 모델 없이 LLMClient 와 같은 stream / generate 제공)
+# - 질문마다 정규화 글자 bigram 과 건강 키워드를 미리 만들어 두고, 둘의 겹침 점수가 가장 높은 답변 반환
+# - 점수가 threshold 미만이면 안내 문구 반환 → 응답 시간이 FAQ 크기에만 비례해 일정
+class FAQResponder:
+    echoes_prompt = False
+
+    def __init__(self, entries, threshold=0.35):
+        self.threshold = threshold
+        self.matcher = HEALTH_MATCHER
+        self.entries = [
+            (self._features(entry["question"]), entry["answer"])
+            for entry in entries
+        ]
+
+    @classmethod
+    def from_file(cls, path=FAQ_PATH, **kwargs):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def _features(self, text):
+        return char_ngrams(normalize_question(text)), frozenset(self.matcher.find(text))
+
+    def answer(self, question):
+        grams, keywords = self._features(question)
+        best_answer, best_score = FALLBACK_ANSWER, self.threshold
+        for (entry_grams, entry_keywords), answer in self.entries:
+            score = 0.5 * _overlap(grams, entry_grams) + 0.5 * _overlap(keywords, entry_keywords)
+            if score >= best_score:
+                best_answer, best_score = answer, score
+        return best_answer
+
+    def stream(self, prompt, max_new_tokens=300):
+        words = self.answer(extract_question(prompt)).split(" ")[:max_new_tokens]
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+
+    def generate(self, prompt, max_new_tokens=300):
+        return "".join(self.stream(prompt, max_new_tokens))
@@ -0,0 +1,288 @@
+import argparse
+import csv
+import json
+import math
+import queue
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+import numpy as np
+
+from batch import load_model, score_array
+from model_io import MODEL_PATH
+from risk import DISEASES, FEATURES, preprocess
+
+WINDOW = 24 * 3600
+BATCH_SIZE = 1024
+LATENESS = 0
+FLUSH_INTERVAL = 1.0
+MEASUREMENTS = ["SBP", "DBP", "weight", "height"]
+PROFILE_FIELDS = ["age", "height", "smoke", "alco"]
+
+
+def parse_time(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+# Health Connect 단위 객체({"inKilograms": 70})는 key 값 x scale, 숫자 / 문자열은 그대로 사용
+def _unit(value, key, scale=1.0):
+    if isinstance(value, dict):
+        value = value.get(key)
+        return None if value is None else float(value) * scale
+    return None if value in (None, "") else float(value)
+
+
+# ✅ Health Connect 레코드 (WeightRecord / BloodPressureRecord / HeightRecord) 또는 평평한 dict → 측정값 dict
+# 결과: {"user", "time", "SBP"?, "DBP"?, "weight"?, "height"?}
+def parse_record(record):
+    user = record.get("userId", record.get("user_id"))
+    reading = {"user": str(user), "time": parse_time(record.get("time", record.get("startTime")))}
+    values = {
+        "weight": _unit(record.get("weight"), "inKilograms"),
+        "height": _unit(record.get("height"), "inMeters", 100.0),
+        "SBP": _unit(record.get("systolic", record.get("SBP")), "inMillimetersOfMercury"),
+        "DBP": _unit(record.get("diastolic", record.get("DBP")), "inMillimetersOfMercury"),
+    }
+    reading.update({key: value for key, value in values.items() if value is not None})
+    return reading
+
+
+# ✅ 입력 소스 → 측정값 generator
+# - http(s)://... : JSON Lines 스트림 (한 줄씩 읽음)
+# - *.csv : user_id, time, SBP, DBP, weight, height 컬럼 (빈 칸 허용)
+# - *.jsonl : 한 줄에 레코드 하나 / *.json : 레코드 배열 또는 {"records": [...]}
+def read_readings(source):
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source) as response:
+            for line in response:
+                if line.strip():
+                    yield parse_record(json.loads(line))
+    elif source.endswith(".csv"):
+        with open(source, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield parse_record(row)
+    elif source.endswith(".jsonl"):
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield parse_record(json.loads(line))
+    else:
+        with open(source, encoding="utf-8") as f:
+            records = json.load(f)
+        for record in records.get("records", []) if isinstance(records, dict) else records:
+            yield parse_record(record)
+
+
+# ✅ 사용자 프로필 CSV (user_id, age, height, smoke, alco) → {user: {...}}
+def load_profiles(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return {
+            row["user_id"]: {field: float(row[field]) for field in PROFILE_FIELDS if row.get(field) not in (None, "")}
+            for row in csv.DictReader(f)
+        }
+
+
+# ✅ 사용자별 시간 구간(window) 집계
+# - 같은 구간의 측정값은 평균, 구간에 없는 측정값은 직전 값을 이어서 사용
+# - 사용자의 새 측정값이 다음 구간에 들어오면 이전 구간을 (user, 구간 끝 시각, 값 dict) 로 내보냄
+# - 늦게 도착한 (이전 구간의) 측정값은 현재 구간에 합산
+# - watermark(지금까지 본 가장 늦은 측정 시각) - lateness 가 구간 끝을 지나면 새 측정값이 없는 사용자의 구간도 닫음
+#   (구간은 모두 같은 시각 격자에 맞춰지므로 구간 시작 시각별로 열린 사용자를 묶어 둠)
+class WindowAggregator:
+    def __init__(self, window=WINDOW, lateness=LATENESS):
+        self.window = window
+        self.lateness = lateness
+        self.watermark = float("-inf")
+        self.open = {}
+        self.latest = {}
+        self._by_start = {}
+
+    def add(self, reading):
+        user = reading["user"]
+        start = reading["time"] // self.window * self.window
+        self.watermark = max(self.watermark, reading["time"])
+        emitted = None
+        state = self.open.get(user)
+        if state is not None and start > state[0]:
+            emitted = self._close(user)
+            state = None
+        if state is None:
+            state = self.open[user] = (start, {}, {})
+            self._by_start.setdefault(start, set()).add(user)
+        _, sums, counts = state
+        for key in MEASUREMENTS:
+            if key in reading:
+                sums[key] = sums.get(key, 0.0) + reading[key]
+                counts[key] = counts.get(key, 0) + 1
+        return emitted
+
+    # ✅ watermark 기준으로 끝난 구간 내보내기
+    def expire(self):
+        for start in sorted(start for start in self._by_start if start + self.window + self.lateness <= self.watermark):
+            for user in list(self._by_start.get(start, ())):
+                yield self._close(user)
+
+    def _close(self, user):
+        start, sums, counts = self.open.pop(user)
+        users = self._by_start[start]
+        users.discard(user)
+        if not users:
+            del self._by_start[start]
+        values = self.latest.setdefault(user, {})
+        values.update({key: sums[key] / counts[key] for key in sums})
+        return user, start + self.window, dict(values)
+
+    def flush(self):
+        for user in list(self.open):
+            yield self._close(user)
+
+
+# ✅ 입력 generator 를 별도 스레드에서 읽고, flush_interval 초 동안 새 값이 없으면 None 을 내보냄
+# (긴 http 스트림이 잠잠해도 모아 둔 예측을 내보낼 수 있도록)
+def with_idle_ticks(items, interval):
+    q = queue.Queue(maxsize=BATCH_SIZE)
+    done = object()
+
+    def pump():
+        try:
+            for item in items:
+                q.put(item)
+        except Exception as error:
+            q.put(error)
+        q.put(done)
+
+    threading.Thread(target=pump, name="ingest-reader", daemon=True).start()
+    while True:
+        try:
+            item = q.get(timeout=interval)
+        except queue.Empty:
+            yield None
+            continue
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+# ✅ 스트리밍 예측 단계
+# - 구간 집계값 + 프로필 → 모델 입력, 입력이 모두 갖춰진 사용자만 예측
+# - 정수로 맞춘 입력이 직전에 예측한 값과 같으면 건너뜀 (바뀐 사용자만 다시 예측)
+# - batch_size 개가 모이거나 가장 오래 기다린 입력이 flush_interval 초를 넘으면 한 번에 예측
+#   (결과 묶음을 list 로 내보내고 store 가 있으면 함께 저장)
+class StreamingScorer:
+    def __init__(self, model, profiles, window=WINDOW, batch_size=BATCH_SIZE, store=None,
+                 lateness=LATENESS, flush_interval=FLUSH_INTERVAL):
+        self.model = model
+        self.profiles = profiles
+        self.aggregator = WindowAggregator(window, lateness)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.store = store
+        self.last_inputs = {}
+        self.pending = []
+        self.pending_since = None
+        self.stats = {"readings": 0, "windows": 0, "scored": 0, "unchanged": 0, "incomplete": 0}
+
+    def run(self, readings):
+        for results in self.run_batches(readings):
+            yield from results
+
+    def run_batches(self, readings):
+        readings = with_idle_ticks(readings, self.flush_interval) if self.flush_interval else readings
+        for reading in readings:
+            if reading is not None:
+                self.stats["readings"] += 1
+                window = self.aggregator.add(reading)
+                if window is not None:
+                    yield from self._queue(window)
+                for window in self.aggregator.expire():
+                    yield from self._queue(window)
+            if self.flush_interval and self.pending and time.monotonic() - self.pending_since >= self.flush_interval:
+                yield from self._score()
+        for window in self.aggregator.flush():
+            yield from self._queue(window)
+        yield from self._score()
+
+    def _queue(self, window):
+        user, end, values = window
+        self.stats["windows"] += 1
+        inputs = {**self.profiles.get(user, {}), **values}
+        if any(key not in inputs or not math.isfinite(inputs[key]) for key in FEATURES + ["age"]):
+            self.stats["incomplete"] += 1
+            return
+        key = tuple(int(round(inputs[key])) for key in FEATURES + ["age"])
+        if self.last_inputs.get(user) == key:
+            self.stats["unchanged"] += 1
+            return
+        self.last_inputs[user] = key
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.append((user, end, key))
+        if len(self.pending) >= self.batch_size:
+            yield from self._score()
+
+    def _score(self):
+        if not self.pending:
+            return
+        users, times, keys = zip(*self.pending)
+        self.pending = []
+        inputs = np.array(keys)
+        features, ages = inputs[:, :-1], inputs[:, -1]
+        model_inputs, bmi = preprocess(features, clip=True)
+        probs = score_array(self.model, model_inputs, ages).astype(np.float64)
+        if self.store is not None:
+            self.store.append(users, features, ages, probs, times)
+        self.stats["scored"] += len(users)
+        yield [
+            {
+                "user": user, "time": times[i], "age": int(ages[i]),
+                **dict(zip(FEATURES, features[i].tolist())), "BMI": round(float(bmi[i]), 2),
+                **dict(zip(DISEASES, probs[i].round(2).tolist())),
+            }
+            for i, user in enumerate(users)
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="웨어러블 측정값 (Health Connect 내보내기) 스트리밍 예측")
+    parser.add_argument("source", help="입력 (.json / .jsonl / .csv 파일 또는 JSON Lines http URL)")
+    parser.add_argument("--profiles", required=True, help="사용자 프로필 CSV (user_id, age, height, smoke, alco)")
+    parser.add_argument("--window", type=float, default=WINDOW, help="집계 구간 (초, 기본 1일)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="한 번에 예측할 사용자 수")
+    parser.add_argument("--lateness", type=float, default=LATENESS, help="구간이 끝난 뒤 늦은 측정값을 기다릴 시간 (초)")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL, help="모은 입력을 예측하기까지 최대 대기 시간 (초, 0 = 크기로만)")
+    parser.add_argument("--model", default=MODEL_PATH, help="모델 파일 경로")
+    parser.add_argument("--store", action="store_true", help="결과를 위험도 기록 저장소에 추가")
+    parser.add_argument("--output", default=None, help="결과 JSON Lines 경로 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    store = None
+    if args.store:
+        from risk_store import RiskStore
+
+        store = RiskStore()
+    scorer = StreamingScorer(
+        load_model(args.model), load_profiles(args.profiles), args.window, args.batch_size, store,
+        args.lateness, args.flush_interval,
+    )
+
+    start = time.perf_counter()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for results in scorer.run_batches(read_readings(args.source)):
+            out.writelines(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+    print(f"✅ {scorer.stats} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+
+# ✅ 기본 건강 관련 키워드
+HEALTH_KEYWORDS = [
+    "건강", "의학", "의료", "약학", "한의학", "당뇨", "비만", "고지혈증", "고혈압",
+    "운동", "영양", "콜레스테롤", "혈압", "혈당", "체중", "심장", "신장", "식습관",
+    "혈액 검사", "당뇨병", "저혈압", "체질량", "콜레스테롤 수치",
+    "암", "위암", "간암", "대장암", "심장병", "뇌졸중", "심근경색", "협심증",
+    "치매", "파킨슨병", "우울증", "불안장애", "스트레스", "알츠하이머", "천식",
+    "간경화", "신부전", "위염", "장염", "소화불량", "갑상선", "류마티스", "관절염",
+    "다이어트", "식이요법", "영양소", "칼슘", "철분", "단백질", "비타민", "미네랄",
+    "섭취량", "칼로리", "저염식", "고단백", "채식", "비건", "간헐적 단식",
+    "면역력", "수면", "건강검진", "예방접종", "운동법", "건강개선", "식단",
+    "유산소 운동", "요가", "필라테스", "명상", "호흡법",
+    "혈당 수치", "혈압 수치", "체지방률", "BMI", "콜레스테롤 검사", "간 수치",
+    "신장 기능 검사", "심전도", "빈혈 검사", "질병",
+]
+
+# ✅ 추가 의학 용어 파일 (한 줄에 하나, # 주석 가능)
+KEYWORDS_PATH = os.environ.get("HEALTH_KEYWORDS_PATH")
+
+
+# ✅ 키워드 파일 읽기
+def load_keywords(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+# ✅ Aho–Corasick 다중 키워드 매처
+# - 키워드로 트라이 + 실패 링크를 import 시 한 번만 만들고, 메시지는 글자당 한 번만 훑음
+#   (키워드가 수천 개로 늘어도 메시지 길이에만 비례)
+# - contains(): 처음 매칭되면 바로 True, find(): 매칭된 키워드 목록 (겹치는 키워드 포함, 끝나는 순서)
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = sorted(set(k for k in keywords if k))
+        self._goto = [{}]
+        self._outputs = [()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._outputs.append(())
+                    self._goto[state][ch] = next_state
+                state = next_state
+            self._outputs[state] = (keyword,)
+        self._fail = [0] * len(self._goto)
+        self._link_failures()
+
+    # 너비 우선으로 실패 링크 연결, 실패 상태의 출력(접미사 키워드)을 미리 합쳐 둠
+    def _link_failures(self):
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state] += outputs[fail[next_state]]
+
+    @classmethod
+    def from_file(cls, path, extra=()):
+        return cls(list(extra) + load_keywords(path))
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _states(self, text):
+        goto, fail = self._goto, self._fail
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            yield state
+
+    def contains(self, text):
+        outputs = self._outputs
+        return any(outputs[state] for state in self._states(text))
+
+    def find(self, text):
+        outputs = self._outputs
+        found = {}
+        for state in self._states(text):
+            for keyword in outputs[state]:
+                found.setdefault(keyword, None)
+        return list(found)
+
+    # ✅ 대량 처리 (채팅 로그 등) - 텍스트마다 매칭된 키워드 목록
+    def find_many(self, texts):
+        for text in texts:
+            yield self.find(text)
+
+
+def default_matcher(path=KEYWORDS_PATH):
+    if path:
+        return KeywordMatcher.from_file(path, extra=HEALTH_KEYWORDS)
+    return KeywordMatcher(HEALTH_KEYWORDS)
+
+
+# ✅ 프로세스 공용 건강 키워드 매처 (import 시 한 번만 생성, 챗봇 / 응답 캐시 / 대화 기록 / FAQ 가 함께 사용)
+HEALTH_MATCHER = default_matcher()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="채팅 로그 건강 키워드 분류 (한 줄에 메시지 하나 → JSON Lines)")
+    parser.add_argument("input", nargs="?", default="-", help="입력 텍스트 파일 (기본: 표준 입력)")
+    parser.add_argument("--keywords", default=KEYWORDS_PATH, help="추가 키워드 파일")
+    args = parser.parse_args()
+
+    matcher = default_matcher(args.keywords)
+    lines = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with lines:
+        for line in lines:
+            text = line.rstrip("\n")
+            matched = matcher.find(text)
+            print(json.dumps({"text": text, "health": bool(matched), "keywords": matched}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
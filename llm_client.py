@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ✅ LLM 설정 (모델 이름 대신 TGI 서버 URL 도 사용 가능)
+LLM_MODEL = os.environ.get("HEALTH_LLM_MODEL", "HuggingFaceH4/zephyr-7b-beta")
+LLM_TIMEOUT = float(os.environ.get("HEALTH_LLM_TIMEOUT", "30"))
+LLM_BACKEND = os.environ.get("HEALTH_LLM_BACKEND", "remote")
+LOCAL_MODEL_PATH = os.environ.get("HEALTH_LOCAL_MODEL_PATH", "models/health-chat.Q4_K_M.gguf")
+LOCAL_THREADS = int(os.environ.get("HEALTH_LOCAL_THREADS", "0")) or None
+MAX_RETRIES = 2
+BACKOFF = 0.5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# ✅ 재시도할 오류인지 판별 (timeout, 연결 오류, 429 / 5xx)
+def is_retryable(error):
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUS
+    return isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in (
+        "ConnectError", "ConnectTimeout", "ReadTimeout", "RemoteProtocolError",
+    )
+
+
+# ✅ 프로세스 단위로 공유하는 LLM 클라이언트
+# - 모델 / 토큰 / timeout 은 한 번만 정하고, HTTP 연결은 huggingface_hub 공용 세션(keep-alive)을 재사용
+# - 요청마다 가벼운 InferenceClient 를 with 로 열고 닫아 응답 객체가 쌓이지 않게 함
+# - 응답이 질문을 되풀이하며 시작할 수 있어 echoes_prompt=True (화면에 표시하기 전에 질문 / 첫 줄 제거)
+class LLMClient:
+    echoes_prompt = True
+
+    def __init__(self, model=LLM_MODEL, token=None, timeout=LLM_TIMEOUT, max_retries=MAX_RETRIES, backoff=BACKOFF):
+        self.model = model
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    # ✅ 토큰 단위 스트리밍 (첫 토큰을 받기 전 오류만 backoff 후 재시도)
+    def stream(self, prompt, max_new_tokens=300):
+        from huggingface_hub import InferenceClient
+
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                with InferenceClient(model=self.model, api_key=self.token, timeout=self.timeout) as client:
+                    for token in client.text_generation(prompt, max_new_tokens=max_new_tokens, stream=True):
+                        started = True
+                        yield token
+                return
+            except Exception as error:
+                if started or attempt == self.max_retries or not is_retryable(error):
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning("⚠️ LLM 요청 실패 (%s), %.1fs 후 재시도", error, delay)
+                time.sleep(delay)
+
+    def generate(self, prompt, max_new_tokens=300):
+        return "".join(self.stream(prompt, max_new_tokens))
+
+
+# ✅ 로컬 CPU LLM (llama.cpp 로 양자화된 GGUF 모델 실행, 프로세스당 한 번 로드)
+# llama.cpp 모델은 동시에 한 요청만 처리하므로 lock 으로 순서대로 생성
+class LocalLLMClient:
+    echoes_prompt = False
+
+    def __init__(self, model_path=LOCAL_MODEL_PATH, n_ctx=2048, n_threads=LOCAL_THREADS):
+        from llama_cpp import Llama
+
+        start = time.perf_counter()
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+        self._lock = threading.Lock()
+        logger.info("✅ 로컬 LLM 로드 (%s): %.3fs", model_path, time.perf_counter() - start)
+
+    def stream(self, prompt, max_new_tokens=300):
+        with self._lock:
+            for chunk in self.llm(prompt, max_tokens=max_new_tokens, stream=True):
+                yield chunk["choices"][0]["text"]
+
+    def generate(self, prompt, max_new_tokens=300):
+        return "".join(self.stream(prompt, max_new_tokens))
+
+
+# ✅ 응답 생성 백엔드 선택 (모두 stream(prompt, max_new_tokens) / generate() / echoes_prompt 제공)
+# - backend="remote": Hugging Face Inference API 또는 TGI 서버 (LLMClient)
+# - backend="local": 로컬 GGUF 모델 (llama-cpp-python 필요)
+# - backend="faq": 로컬 건강 FAQ 검색 응답 (모델 / 네트워크 없음)
+def create_llm_client(backend=None, token=None):
+    backend = backend or LLM_BACKEND
+    if backend == "remote":
+        return LLMClient(token=token)
+    if backend == "local":
+        return LocalLLMClient()
+    if backend == "faq":
+        from faq_engine import FAQResponder
+
+        return FAQResponder.from_file()
+    raise ValueError(f"알 수 없는 LLM 백엔드입니다: {backend}")
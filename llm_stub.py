@@ -0,0 +1,95 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ✅ 로컬 테스트용 text-generation 서버 (TGI 응답 형식 흉내)
+# HEALTH_LLM_MODEL=http://127.0.0.1:<port> 로 앱 / 부하 테스트를 네트워크 없이 실행할 때 사용
+DEFAULT_ANSWER = (
+    "건강 상담 답변입니다.\n"
+    "규칙적인 유산소 운동과 싱겁게 먹는 식습관은 혈압과 혈당 관리에 도움이 됩니다. "
+    "증상이 계속되면 가까운 병원에서 진료를 받아보시기 바랍니다."
+)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        server.requests += 1
+        max_new_tokens = body.get("parameters", {}).get("max_new_tokens") or 300
+        tokens = server.answer.split(" ")[:max_new_tokens]
+        tokens = [token + " " for token in tokens[:-1]] + tokens[-1:]
+
+        if server.fail_next > 0:
+            server.fail_next -= 1
+            self._send_json(503, {"error": "Model is overloaded"})
+            return
+
+        if body.get("stream") or self.path.endswith("generate_stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, token in enumerate(tokens):
+                time.sleep(server.token_delay)
+                event = {
+                    "index": i,
+                    "token": {"id": i, "text": token, "logprob": 0.0, "special": False},
+                    "generated_text": server.answer if i == len(tokens) - 1 else None,
+                    "details": None,
+                }
+                self._write_chunk(f"data:{json.dumps(event, ensure_ascii=False)}\n\n".encode())
+            self._write_chunk(b"")
+        else:
+            time.sleep(server.token_delay * len(tokens))
+            self._send_json(200, [{"generated_text": "".join(tokens)}])
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ✅ 백그라운드 스레드로 서버 실행 → (server, url)
+def start_stub_server(port=0, token_delay=0.01, answer=DEFAULT_ANSWER, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), StubLLMHandler)
+    server.daemon_threads = True
+    server.token_delay = token_delay
+    server.answer = answer
+    server.requests = 0
+    server.fail_next = 0
+    threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 text-generation 테스트 서버")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token-delay", type=float, default=0.01, help="토큰 사이 지연 (초)")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.token_delay)
+    print(f"✅ 테스트 LLM 서버: {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from risk import FEATURE_RANGES
+
+PAGES = {"eda": "run_eda", "snagdam": "run_snagdam"}
+# ✅ 채팅 질문 (나이 / 성별 / 주제 / 질문 조합 → 세션마다 대부분 다른 건강 질문, 응답 캐시에 거의 적중하지 않음)
+CHAT_TOPICS = ["혈압", "혈당", "콜레스테롤", "체중", "수면", "스트레스", "당뇨병", "고지혈증"]
+CHAT_TEMPLATES = [
+    "{who}인데 {topic} 관리하려면 어떤 운동이 좋을까요?",
+    "{who}인데 {topic} 때문에 식단을 어떻게 바꿔야 하나요?",
+    "{who}입니다. {topic} 수치가 높으면 어떤 검사를 받아야 하나요?",
+    "{who}인데 {topic}에 좋은 생활 습관을 알려주세요",
+]
+SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from {module} import {func}
+{func}()
+"""
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return {
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+def random_form(rng):
+    return {
+        "gender": rng.choice(["여성", "남성"]),
+        "age": rng.randint(10, 100),
+        **{feature: rng.randint(*FEATURE_RANGES[feature]) for feature in ["height", "weight", "SBP", "DBP"]},
+        "smoke": int(rng.random() < 0.3),
+        "alco": int(rng.random() < 0.3),
+    }
+
+
+def random_question(rng):
+    who = f"{rng.randint(20, 80)}세 {rng.choice(['남성', '여성'])}"
+    return rng.choice(CHAT_TEMPLATES).format(who=who, topic=rng.choice(CHAT_TOPICS))
+
+
+class _Placeholder:
+    def markdown(self, text):
+        pass
+
+
+# ✅ direct 모드 세션 - 페이지 스크립트 대신 폼 제출 / 채팅 한 번에 실행되는 함수들을 직접 호출
+# (Streamlit 렌더링 제외, 한 프로세스 안에서 스레드로 동시에 실행 → 모델 / 캐시 / LLM 클라이언트 공유)
+# 채팅은 기본으로 응답 캐시를 거치지 않아 매번 LLM 서버까지 요청 (use_cache=True 면 페이지와 같이 캐시 사용)
+class DirectSession:
+    def __init__(self, page, seed, history_dir=None, use_cache=False):
+        self.page = page
+        self.use_cache = use_cache
+        self.rng = random.Random(seed)
+        self.history = None
+        if page == "snagdam":
+            from chat_history import ChatHistory
+
+            self.history = ChatHistory(directory=history_dir)
+
+    def open(self):
+        start = time.perf_counter()
+        import eda
+        import snagdam
+
+        if self.page == "eda":
+            eda.load_model()
+        else:
+            snagdam.get_llm_client()
+        return (time.perf_counter() - start) * 1000, False
+
+    def act(self):
+        start = time.perf_counter()
+        try:
+            self._submit_form() if self.page == "eda" else self._send_chat()
+            failed = False
+        except Exception:
+            failed = True
+        return (time.perf_counter() - start) * 1000, failed
+
+    def _submit_form(self):
+        import eda
+        from risk import DISEASES, health_status_array, summarize_health_array
+
+        form = random_form(self.rng)
+        probs, bmi = eda.predict_risk(
+            eda.load_model(), form["age"], form["SBP"], form["DBP"], form["weight"], form["height"], form["smoke"], form["alco"]
+        )
+        health_status_array(probs[0])
+        summarize_health_array(probs)
+        prob_dict = dict(zip(DISEASES, probs[0]))
+        fig = eda.build_comparison_figure(form["gender"], form["weight"], bmi, form["SBP"], form["DBP"], prob_dict)
+        fig.to_json()
+
+    def _send_chat(self):
+        import snagdam
+        from chat_history import ASSISTANT, USER
+
+        clean_chat = snagdam.clean_input(random_question(self.rng))
+        if not snagdam.is_health_related(clean_chat):
+            raise RuntimeError(f"건강 질문으로 판별되지 않았습니다: {clean_chat}")
+        full_prompt, context = snagdam.build_prompt(clean_chat, self.history)
+        self.history.append(USER, clean_chat)
+        response = snagdam.generate_response(full_prompt, clean_chat, _Placeholder(), use_cache=self.use_cache and not context)
+        if response.startswith("⚠️"):
+            raise RuntimeError(response)
+        self.history.append(ASSISTANT, response)
+
+
+# ✅ apptest 모드 세션 - Streamlit AppTest 로 페이지 스크립트 전체를 실행 (상호작용마다 스크립트 재실행)
+class AppTestSession:
+    def __init__(self, page, seed, timeout=60.0):
+        from streamlit.testing.v1 import AppTest
+
+        root = os.path.dirname(os.path.abspath(__file__))
+        self.page = page
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_string(SCRIPT.format(root=root, module=page, func=PAGES[page]), default_timeout=timeout)
+
+    def open(self):
+        return self._timed(self.app.run)
+
+    def act(self):
+        return self._timed(self._submit_form if self.page == "eda" else self._send_chat)
+
+    def _submit_form(self):
+        app, form = self.app, random_form(self.rng)
+        app.radio[0].set_value(form["gender"])
+        app.slider[0].set_value(form["age"])
+        for widget, feature in zip(app.number_input, ["height", "weight", "SBP", "DBP"]):
+            widget.set_value(form[feature])
+        app.checkbox[0].set_value(bool(form["smoke"]))
+        app.checkbox[1].set_value(bool(form["alco"]))
+        app.button[0].click().run()
+
+    def _send_chat(self):
+        self.app.chat_input[0].set_value(random_question(self.rng)).run()
+
+    def _timed(self, action):
+        start = time.perf_counter()
+        try:
+            action()
+            failed = bool(self.app.exception)
+        except Exception:
+            failed = True
+        return (time.perf_counter() - start) * 1000, failed
+
+
+# ✅ 세션 여러 개를 순서대로 실행 → (열기 지연, 상호작용 지연, 오류 수, 세션당 메모리 MB)
+def _run_sessions(make_session, seeds, actions, keep):
+    opens, latencies, errors = [], [], 0
+    rss_start = rss_mb()
+    for seed in seeds:
+        session = make_session(seed)
+        results = [session.open()] + [session.act() for _ in range(actions)]
+        opens.append(results[0][0])
+        latencies.extend(elapsed for elapsed, _ in results[1:])
+        errors += sum(failed for _, failed in results)
+        keep.append(session)
+    memory = (rss_mb() - rss_start) / len(seeds) if seeds else None
+    return opens, latencies, errors, memory
+
+
+# 워커 프로세스마다 예열 세션 하나를 먼저 실행 (import / 모델 로드는 결과에서 제외)
+def _apptest_worker(page, seeds, actions, timeout):
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    warmup = AppTestSession(page, -1, timeout)
+    warmup.open()
+    warmup.act()
+    return _run_sessions(lambda seed: AppTestSession(page, seed, timeout), seeds, actions, [])
+
+
+def _chat_cache_stats(page):
+    if page != "snagdam":
+        return {}
+    import snagdam
+
+    return snagdam.get_response_cache().stats()
+
+
+# ✅ 페이지 하나에 sessions 개 세션을 concurrency 개씩 동시에 실행
+# - direct: 한 프로세스 안에서 concurrency 개 스레드 (한 인스턴스가 받는 동시 요청과 같은 조건)
+# - apptest: AppTest 는 프로세스 전역 런타임을 쓰므로 동시에 실행할 수 없음 → concurrency 개 프로세스에 나눠 실행
+def run_page(page, sessions, actions, concurrency, mode="direct", timeout=60.0, seed=0, chat_cache=False):
+    concurrency = max(1, min(concurrency, sessions))
+    groups = [list(range(seed + i, seed + sessions, concurrency)) for i in range(concurrency)]
+
+    start = time.perf_counter()
+    if mode == "apptest":
+        with ProcessPoolExecutor(max_workers=concurrency) as pool:
+            outputs = list(pool.map(_apptest_worker, [page] * concurrency, groups, [actions] * concurrency, [timeout] * concurrency))
+    else:
+        history_dir = tempfile.mkdtemp(prefix="health-loadtest-history-")
+        keep, lock = [], threading.Lock()
+        warmup = DirectSession(page, -1, history_dir, chat_cache)  # import / 모델 로드는 결과에서 제외
+        warmup.open()
+        warmup.act()
+        rss_before = rss_mb()
+        cache_before = _chat_cache_stats(page)
+
+        def worker(seeds):
+            sessions_kept = []
+            output = _run_sessions(lambda s: DirectSession(page, s, history_dir, chat_cache), seeds, actions, sessions_kept)
+            with lock:
+                keep.extend(sessions_kept)
+            return output
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outputs = list(pool.map(worker, groups))
+        # 스레드끼리 메모리를 공유하므로 전체 증가량을 세션 수로 나눔
+        per_session = (rss_mb() - rss_before) / len(keep)
+        outputs = [(opens, latencies, errors, per_session) for opens, latencies, errors, _ in outputs]
+        cache_after = _chat_cache_stats(page)
+    elapsed = time.perf_counter() - start
+
+    opens = [value for output in outputs for value in output[0]]
+    latencies = [value for output in outputs for value in output[1]]
+    memory = [output[3] for output in outputs if output[3] is not None]
+    result = {
+        "mode": mode,
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "interactions": len(latencies),
+        "errors": sum(output[2] for output in outputs),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "open": percentiles(opens),
+        "interaction": percentiles(latencies),
+        "memory_per_session_mb": statistics.fmean(memory) if memory else None,
+    }
+    if mode == "direct" and page == "snagdam":
+        hits, misses = (cache_after[key] - cache_before[key] for key in ("hits", "misses"))
+        result["chat_cache"] = {
+            "enabled": chat_cache,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 동시 세션 부하 테스트 (질병 예측 / 상담 챗봇 페이지)")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--mode", default="direct", choices=["direct", "apptest"], help="direct: 함수 직접 호출 / apptest: Streamlit AppTest")
+    parser.add_argument("--sessions", type=int, default=50, help="페이지별 세션 수")
+    parser.add_argument("--actions", type=int, default=5, help="세션당 상호작용 수 (폼 제출 / 채팅)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 실행할 세션 수")
+    parser.add_argument("--chat-cache", action="store_true", help="direct 모드 채팅도 응답 캐시 사용 (기본: 캐시 없이 매번 LLM 요청)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="테스트 LLM 서버 토큰 간격 (초)")
+    parser.add_argument("--llm-url", default=None, help="사용할 LLM 서버 URL (기본: 로컬 테스트 서버 실행)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    # 페이지 모듈이 환경 변수를 읽기 전에 테스트용 설정 (로컬 LLM 서버, 임시 캐시 / 기록 경로)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    workdir = tempfile.mkdtemp(prefix="health-loadtest-")
+    os.environ.setdefault("HEALTH_CHAT_CACHE_PATH", os.path.join(workdir, "chat_responses.jsonl"))
+    os.environ.setdefault("HEALTH_CHAT_HISTORY_DIR", os.path.join(workdir, "chat_history"))
+    os.environ.setdefault("HEALTH_RISK_STORE_DIR", os.path.join(workdir, "risk_store"))
+    stub = None
+    if "snagdam" in args.pages:
+        if args.llm_url:
+            os.environ["HEALTH_LLM_MODEL"] = args.llm_url
+        else:
+            from llm_stub import start_stub_server
+
+            stub, url = start_stub_server(token_delay=args.token_delay)
+            os.environ["HEALTH_LLM_MODEL"] = url
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "model_backend": os.environ.get("HEALTH_MODEL_BACKEND", "auto"),
+            "llm_backend": os.environ.get("HEALTH_LLM_BACKEND", "remote"),
+        },
+        "pages": {},
+    }
+    try:
+        for page in args.pages:
+            requests_before = stub.requests if stub is not None else 0
+            results["pages"][page] = run_page(
+                page, args.sessions, args.actions, args.concurrency, args.mode, chat_cache=args.chat_cache
+            )
+            if stub is not None and page == "snagdam":
+                results["pages"][page]["llm_requests"] = stub.requests - requests_before
+    finally:
+        if stub is not None:
+            results["meta"]["llm_requests"] = stub.requests
+            stub.shutdown()
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ 저장 완료: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
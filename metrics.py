@@ -0,0 +1,178 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# ✅ 환경 변수로 켜고 끔 (꺼져 있으면 timed()는 아무것도 하지 않는 객체를 반환)
+ENABLED = os.environ.get("HEALTH_METRICS", "").lower() in ("1", "true", "yes")
+PREFIX = "health"
+
+# ✅ 지연 시간 히스토그램 구간 (초)
+BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+_lock = threading.Lock()
+_histograms = {}
+_errors = {}
+_collectors = []
+_started = False
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Timer:
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.stage, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+# ✅ 구간 시간 측정: with timed("model_predict"): ...
+def timed(stage):
+    return _Timer(stage) if ENABLED else _NOOP
+
+
+def observe(stage, seconds, error=False):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = _Histogram()
+        histogram.observe(seconds)
+        if error:
+            _errors[stage] = _errors.get(stage, 0) + 1
+
+
+# ✅ 게이지 수집 함수 등록 (예: 캐시 적중률) - {이름: 값} dict 를 반환하는 함수
+def register_collector(collector):
+    with _lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def _gauges():
+    values = {}
+    for collector in list(_collectors):
+        try:
+            values.update(collector())
+        except Exception:
+            logger.exception("metrics collector failed")
+    return values
+
+
+# ✅ Prometheus text 포맷
+def render_prometheus():
+    lines = [
+        f"# HELP {PREFIX}_stage_latency_seconds Stage latency.",
+        f"# TYPE {PREFIX}_stage_latency_seconds histogram",
+    ]
+    with _lock:
+        histograms = {stage: (list(h.counts), h.total, h.count) for stage, h in _histograms.items()}
+        errors = dict(_errors)
+
+    for stage, (counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + ["+Inf"], counts):
+            cumulative += bucket_count
+            lines.append(f'{PREFIX}_stage_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{PREFIX}_stage_latency_seconds_sum{{stage="{stage}"}} {total}')
+        lines.append(f'{PREFIX}_stage_latency_seconds_count{{stage="{stage}"}} {count}')
+
+    lines.append(f"# HELP {PREFIX}_stage_errors_total Stage errors.")
+    lines.append(f"# TYPE {PREFIX}_stage_errors_total counter")
+    for stage, count in sorted(errors.items()):
+        lines.append(f'{PREFIX}_stage_errors_total{{stage="{stage}"}} {count}')
+
+    for name, value in sorted(_gauges().items()):
+        lines.append(f"# TYPE {PREFIX}_{name} gauge")
+        lines.append(f"{PREFIX}_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# ✅ 한 줄 요약 (주기적 로그용)
+def summary_line():
+    with _lock:
+        parts = [
+            f"{stage}: n={h.count} avg={h.total / h.count * 1000:.1f}ms err={_errors.get(stage, 0)}"
+            for stage, h in sorted(_histograms.items()) if h.count
+        ]
+    parts += [f"{name}={value:.3g}" for name, value in sorted(_gauges().items())]
+    return " | ".join(parts)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="0.0.0.0"):
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("✅ metrics endpoint: http://%s:%d/metrics", host, port)
+    return server
+
+
+def start_log_reporter(interval):
+    def report():
+        while True:
+            time.sleep(interval)
+            line = summary_line()
+            if line:
+                logger.info("📊 %s", line)
+
+    threading.Thread(target=report, name="metrics-log", daemon=True).start()
+
+
+# ✅ 환경 변수 설정에 따라 exporter 시작 (프로세스당 한 번)
+# - HEALTH_METRICS_PORT: Prometheus text 엔드포인트 포트
+# - HEALTH_METRICS_LOG_INTERVAL: 요약 로그 주기 (초)
+def start_exporters():
+    global _started
+    with _lock:
+        if not ENABLED or _started:
+            return
+        _started = True
+
+    port = os.environ.get("HEALTH_METRICS_PORT")
+    if port:
+        start_http_server(int(port))
+    interval = os.environ.get("HEALTH_METRICS_LOG_INTERVAL")
+    if interval:
+        start_log_reporter(float(interval))
@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = "regressor_xg"
+NATIVE_SUFFIX = ".ubj"
+TREE_SUFFIX = ".npz"
+TABLE_SUFFIX = ".table.npy"
+SOURCE_SUFFIX = ".source.json"
+# 변환 파일별 다시 만드는 명령 (원본 pickle 과 맞지 않을 때 안내)
+REBUILD_COMMANDS = {NATIVE_SUFFIX: "python model_io.py", TREE_SUFFIX: "python tree_engine.py", TABLE_SUFFIX: "python risk_table.py"}
+
+
+# ✅ XGBoost Booster 직접 예측 (sklearn 래퍼 / DMatrix 생성 없이 inplace_predict)
+class NativePredictor:
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, features):
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        return self.booster.inplace_predict(features, validate_features=False)
+
+
+# ✅ 원본 pickle 해시 (변환 파일 옆 <파일>.source.json 에 기록 → 로드할 때 같은 pickle 에서 만든 파일인지 확인)
+def model_digest(model_path=MODEL_PATH):
+    with open(model_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_source(artifact_path, model_path=MODEL_PATH):
+    with open(artifact_path + SOURCE_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump({"model": os.path.basename(model_path), "sha256": model_digest(model_path)}, f)
+
+
+# 기록이 없거나 해시가 다르면 False (pickle 이 없으면 비교할 대상이 없으므로 True)
+def is_current(artifact_path, model_path=MODEL_PATH):
+    if not os.path.exists(model_path):
+        return True
+    try:
+        with open(artifact_path + SOURCE_SUFFIX, encoding="utf-8") as f:
+            return json.load(f).get("sha256") == model_digest(model_path)
+    except (OSError, ValueError):
+        return False
+
+
+def _warn_stale(artifact_path, model_path, suffix):
+    logger.warning(
+        "⚠️ %s 이(가) 현재 %s 에서 만들어진 파일이 아니어서 pickle 모델을 사용합니다. (다시 만들기: %s)",
+        artifact_path, model_path, REBUILD_COMMANDS[suffix],
+    )
+
+
+# ✅ pickle 모델 → XGBoost 네이티브 포맷 (.ubj / .json) 변환
+def export_native(model_path=MODEL_PATH, native_path=None):
+    native_path = native_path or model_path + NATIVE_SUFFIX
+    model = joblib.load(model_path)
+    model.get_booster().save_model(native_path)
+    write_source(native_path, model_path)
+    return native_path
+
+
+# ✅ 모델 로드
+# - backend="auto": 네이티브 파일(모델 경로 + .ubj)이 있으면 Booster, 없으면 기존 pickle
+# - backend="pickle": 항상 기존 joblib pickle
+# - backend="tree": 트리 배열 파일(모델 경로 + .npz)을 NumPy로 직접 예측 (xgboost import 없음)
+# - backend="table": 미리 계산한 위험도 표(모델 경로 + .table.npy)를 mmap으로 열어 인덱싱만 수행
+# - backend="service": 별도 예측 서버(predict_server.py, HEALTH_PREDICT_URL)에 요청 (모델을 로드하지 않음)
+# - .ubj / .npz / .table.npy 가 현재 pickle 에서 만들어지지 않았으면 경고 후 pickle 사용 (오래된 모델을 조용히 쓰지 않도록)
+def load_predictor(model_path=MODEL_PATH, native_path=None, backend=None):
+    backend = backend or os.environ.get("HEALTH_MODEL_BACKEND", "auto")
+    native_path = native_path or model_path + NATIVE_SUFFIX
+    suffix = {"tree": TREE_SUFFIX, "table": TABLE_SUFFIX}.get(backend)
+    if suffix and not is_current(model_path + suffix, model_path):
+        _warn_stale(model_path + suffix, model_path, suffix)
+        backend = "pickle"
+    use_native = backend == "auto" and os.path.exists(native_path)
+    if use_native and not is_current(native_path, model_path):
+        _warn_stale(native_path, model_path, NATIVE_SUFFIX)
+        use_native = False
+
+    start = time.perf_counter()
+    if backend == "tree":
+        from tree_engine import TreeEnsemble
+
+        source = model_path + TREE_SUFFIX
+        predictor = TreeEnsemble.from_file(source)
+    elif backend == "table":
+        from risk_table import RiskTable
+
+        source = model_path + TABLE_SUFFIX
+        predictor = RiskTable.load(source)
+    elif backend == "service":
+        from predict_server import SERVICE_URL, RemotePredictor
+
+        source = SERVICE_URL
+        predictor = RemotePredictor(source)
+    elif backend not in ("auto", "pickle"):
+        raise ValueError(f"알 수 없는 모델 백엔드입니다: {backend}")
+    elif use_native:
+        import xgboost as xgb
+
+        predictor = NativePredictor(xgb.Booster(model_file=native_path))
+        source = native_path
+    else:
+        predictor = joblib.load(model_path)
+        source = model_path
+    logger.info("✅ 모델 로드 (%s): %.3fs", source, time.perf_counter() - start)
+    return predictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="regressor_xg → XGBoost 네이티브 포맷 변환")
+    parser.add_argument("--model", default=MODEL_PATH, help="pickle 모델 경로")
+    parser.add_argument("--output", default=None, help="출력 경로 (.ubj / .json, 기본: 모델 경로 + .ubj)")
+    args = parser.parse_args()
+
+    path = export_native(args.model, args.output)
+    print(f"✅ 저장 완료: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import http.client
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from model_io import MODEL_PATH, load_predictor
+from risk import FEATURES
+
+logger = logging.getLogger(__name__)
+
+SERVICE_URL = os.environ.get("HEALTH_PREDICT_URL", "http://127.0.0.1:8600")
+BATCH_WINDOW = 0.002
+MAX_BATCH_ROWS = 4096
+
+
+# ✅ 동시에 들어온 요청을 짧은 시간(batch_window) 동안 모아 predict 한 번으로 처리
+class MicroBatcher:
+    def __init__(self, predictor, batch_window=BATCH_WINDOW, max_rows=MAX_BATCH_ROWS):
+        self.predictor = predictor
+        self.batch_window = batch_window
+        self.max_rows = max_rows
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._inflight = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="micro-batcher", daemon=True).start()
+
+    # features: (N, 6) FEATURES 순서의 유한한 숫자 (모양이 다르거나 NaN / 무한대가 있으면 ValueError → 400)
+    def predict(self, features):
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != len(FEATURES):
+            raise ValueError(f"입력 모양이 맞지 않습니다: {features.shape} (필요: (N, {len(FEATURES)}))")
+        if not np.isfinite(features).all():
+            raise ValueError("입력값이 비어 있거나 숫자가 아닙니다.")
+
+        future = Future()
+        with self._lock:
+            self._inflight += 1
+        try:
+            self._queue.put((features, future))
+            return future.result()
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    # 처리 중인 다른 요청이 더 없으면 기다리지 않고 바로 예측 (요청이 하나뿐일 때 지연 없음)
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            rows = len(items[0][0])
+            deadline = time.perf_counter() + self.batch_window
+            while rows < self.max_rows and len(items) < self._inflight:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                items.append(item)
+                rows += len(item[0])
+
+            try:
+                outputs = np.asarray(self.predictor.predict(np.concatenate([features for features, _ in items])))
+            except Exception as error:
+                for _, future in items:
+                    future.set_exception(error)
+                continue
+            self.batches += 1
+            self.rows += rows
+            start = 0
+            for features, future in items:
+                future.set_result(outputs[start:start + len(features)])
+                start += len(features)
+
+
+class PredictHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # POST /predict {"features": [[SBP, DBP, weight, height, smoke, alco], ...]} → {"predictions": [[...4], ...]}
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            outputs = self.server.batcher.predict(body["features"])
+        except (KeyError, TypeError, ValueError) as error:
+            self._send_json(400, {"error": str(error)})
+            return
+        except Exception as error:
+            logger.exception("prediction failed")
+            self._send_json(500, {"error": str(error)})
+            return
+        self._send_json(200, {"predictions": outputs.tolist()})
+
+    def do_GET(self):
+        if self.path == "/health":
+            batcher = self.server.batcher
+            self._send_json(200, {"pid": os.getpid(), "batches": batcher.batches, "rows": batcher.rows})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ✅ 예측 서버 실행
+# - 부모 프로세스가 모델을 한 번 로드하고 소켓을 연 뒤 workers 개로 fork → 모델 배열은 copy-on-write 로 공유
+#   (table 백엔드는 mmap 이라 페이지 캐시까지 공유, xgboost 백엔드는 fork 전에 예측하지 않음)
+# - 워커는 같은 소켓에서 연결을 받고, 워커마다 micro-batcher 하나가 요청을 모아 예측
+def serve(port=8600, host="127.0.0.1", workers=None, model_path=MODEL_PATH, backend=None, batch_window=BATCH_WINDOW):
+    workers = workers or os.cpu_count() or 1
+    predictor = load_predictor(model_path, backend=backend)
+    server = ThreadingHTTPServer((host, port), PredictHandler)
+    server.daemon_threads = True
+
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = []
+            break
+        children.append(pid)
+
+    # 부모 프로세스는 SIGTERM 을 받으면 워커를 정리한 뒤 종료
+    if children:
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    server.batcher = MicroBatcher(predictor, batch_window)
+    logger.info("✅ 예측 서버 워커 %d: http://%s:%d", os.getpid(), host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+
+
+# ✅ 예측 서버 클라이언트 (load_predictor 결과와 같은 predict(features) 제공)
+# 스레드마다 keep-alive 연결 하나를 재사용, 끊긴 연결은 한 번 다시 연결
+class RemotePredictor:
+    def __init__(self, url=SERVICE_URL, timeout=10.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, fresh=False):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or fresh:
+            if connection is not None:
+                connection.close()
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            connection.connect()
+            connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def predict(self, features):
+        body = json.dumps({"features": np.asarray(features).tolist()})
+        for attempt in range(2):
+            connection = self._connection(fresh=attempt > 0)
+            try:
+                connection.request("POST", "/predict", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                payload = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"예측 서버 오류 ({response.status}): {payload.get('error')}")
+        return np.asarray(payload["predictions"], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 모델 예측 서버 (멀티 프로세스 + micro-batching)")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--model", default=MODEL_PATH, help="모델 파일 경로")
+    parser.add_argument("--backend", default=None, help="모델 백엔드 (auto / pickle / tree / table)")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW, help="요청을 모으는 시간 (초)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(args.port, args.host, args.workers, args.model, args.backend, args.batch_window)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import numpy as np
+
+# ✅ 모델 출력 순서 (train.TARGET_COLUMNS 와 동일: 고혈압 / 당뇨 / 고지혈증 위험, BMI - train.check_model 로 확인)
+MODEL_OUTPUTS = ["고혈압", "당뇨병", "고지혈증", "BMI"]
+# ✅ 위험 확률로 보여주는 질병 (MODEL_OUTPUTS 에서 BMI 를 뺀 것, disease_probabilities 로 선택)
+DISEASES = ["고혈압", "당뇨병", "고지혈증"]
+# ✅ 모델 입력 컬럼 순서
+FEATURES = ["SBP", "DBP", "weight", "height", "smoke", "alco"]
+
+# ✅ 입력값 허용 범위 (입력 폼과 동일)
+FEATURE_RANGES = {
+    "SBP": (50, 200),
+    "DBP": (40, 150),
+    "weight": (30, 200),
+    "height": (120, 250),
+    "smoke": (0, 1),
+    "alco": (0, 1),
+}
+
+_RANGES = np.array([FEATURE_RANGES[feature] for feature in FEATURES], dtype=np.float32)
+_WEIGHT, _HEIGHT = FEATURES.index("weight"), FEATURES.index("height")
+_DISEASE_OUTPUTS = [MODEL_OUTPUTS.index(disease) for disease in DISEASES]
+
+# ✅ 나이 구간별 가중치 (행: 30 미만, 40 미만, 50 미만, 60 미만, 60 이상 / 열: DISEASES 순서)
+AGE_BINS = np.array([30, 40, 50, 60])
+AGE_FACTORS = np.array([
+    [0, 0, 0],
+    [5, 5, 5],
+    [10, 10, 6],
+    [25, 30, 10],
+    [25, 30, 10],
+], dtype=np.float64)
+
+# ✅ 위험 수준 구간 (20 이하, 40 이하, 60 이하, 80 이하, 그 이상)
+RISK_BINS = np.array([20, 40, 60, 80])
+STATUS_LABELS = np.array(["🟢 매우 안전", "🟢 안전", "🟡 주의", "🟠 위험", "🔴 위급"])
+STATUS_TEXTS = np.array(["✅ 건강 유지!", "👍 건강 양호", "⚠️ 주의 필요", "🚨 건강 경고!", "⛔ 즉시 조치 필요!"])
+STATUS_ADVICE = np.array([
+    "위험이 거의 없습니다. 현재 건강을 잘 유지하세요!",
+    "위험이 낮습니다. 균형 잡힌 식사를 유지하세요.",
+    "위험이 증가 중입니다. 생활 습관 개선이 필요합니다.",
+    "위험이 높습니다. 정기 검진과 건강 관리가 필요합니다.",
+    "위험이 매우 높습니다! 병원 진료를 권장합니다.",
+])
+
+# ✅ 종합 진단 문구 (질병 평균 확률 기준)
+SUMMARY_MESSAGES = np.array([
+    "✅ 전반적으로 건강 상태가 양호합니다! 좋은 생활 습관을 계속 유지하세요.",
+    "👍 현재 건강 상태는 안정적입니다. 하지만 꾸준한 건강 관리가 필요합니다.",
+    "⚠️ 건강 상태에 주의가 필요합니다. 생활 습관 개선을 고려해보세요.",
+    "🚨 건강 위험 수준이 높아지고 있습니다. 적극적인 건강 관리가 필요합니다!",
+    "⛔ 건강 위험이 매우 높습니다! 즉시 의료 전문가와 상담하세요.",
+])
+
+
+# ✅ BMI = 체중(kg) / 키(m)^2
+def body_mass_index(weight, height):
+    return weight / (height / 100) ** 2
+
+
+# ✅ 모델 입력 전처리 (폼 / 배치 공통) - 한 번의 float32 변환으로 범위 검사, BMI 계산, 스케일링까지
+# - features: (N, 6) 또는 (6,) FEATURES 순서 → (모델 입력 (N, 6) float32 연속 배열, BMI (N,))
+# - 빈 값(NaN) / 무한대는 항상 ValueError (NaN 은 범위 비교를 모두 통과하므로 먼저 확인)
+# - 범위를 벗어난 값은 clip=False 면 ValueError, clip=True 면 범위 안으로 맞춤
+# - scaler: mean_ / scale_ 이 있는 StandardScaler (FEATURES 와 같은 6개 컬럼으로 학습된 경우만)
+def preprocess(features, clip=False, scaler=None):
+    features = np.array(np.atleast_2d(features), dtype=np.float32, order="C")
+    if features.ndim != 2 or features.shape[1] != len(FEATURES):
+        raise ValueError(f"입력 컬럼 수가 맞지 않습니다: {features.shape} (필요: {FEATURES})")
+
+    finite = np.isfinite(features).all(axis=0)
+    if not finite.all():
+        columns = [feature for feature, ok in zip(FEATURES, finite) if not ok]
+        raise ValueError(f"입력값이 비어 있거나 숫자가 아닙니다: {columns}")
+
+    low, high = _RANGES[:, 0], _RANGES[:, 1]
+    if clip:
+        np.clip(features, low, high, out=features)
+    else:
+        invalid = ((features < low) | (features > high)).any(axis=0)
+        if invalid.any():
+            columns = [feature for feature, bad in zip(FEATURES, invalid) if bad]
+            raise ValueError(f"입력값이 허용 범위를 벗어났습니다: {columns}")
+
+    bmi = body_mass_index(features[:, _WEIGHT], features[:, _HEIGHT])
+    if scaler is not None:
+        if getattr(scaler, "n_features_in_", len(FEATURES)) != len(FEATURES):
+            raise ValueError(f"스케일러 입력 컬럼 수({scaler.n_features_in_})가 모델 입력({len(FEATURES)})과 다릅니다.")
+        features -= np.asarray(scaler.mean_, dtype=np.float32)
+        features /= np.asarray(scaler.scale_, dtype=np.float32)
+    return features, bmi
+
+
+# ✅ 모델 원본 출력 → 0~100 사이 확률 (소수점 2자리)
+# float32 로 반올림하면 float64 로 바뀔 때 19.520000457... 처럼 되므로 float64 로 바꾼 뒤 반올림
+def clip_predictions(raw):
+    return np.clip(np.round(np.asarray(raw, dtype=np.float64), 2), 0, 100)
+
+
+# ✅ 모델 원본 출력 (N, 4) → 질병 위험 확률 (N, 3) (BMI 출력은 위험 확률이 아니므로 제외)
+def disease_probabilities(raw):
+    return clip_predictions(np.atleast_2d(raw)[:, _DISEASE_OUTPUTS])
+
+
+# ✅ 나이 가중치 적용 (N,) 나이 + (N, 3) 확률 → (N, 3)
+def adjust_by_age_array(ages, probs):
+    idx = np.digitize(np.asarray(ages), AGE_BINS)
+    return np.minimum(probs + AGE_FACTORS[idx], 100)
+
+
+# ✅ 확률 → 위험 수준 인덱스 (0: 매우 안전 ~ 4: 위급)
+def risk_levels(probs):
+    return np.digitize(probs, RISK_BINS, right=True)
+
+
+# ✅ 위험 수준 → (상태, 상태 문구, 조언) 배열
+def health_status_array(probs):
+    levels = risk_levels(probs)
+    return STATUS_LABELS[levels], STATUS_TEXTS[levels], STATUS_ADVICE[levels]
+
+
+# ✅ (N, 3) 확률 → (N,) 종합 진단 문구
+def summarize_health_array(probs):
+    return SUMMARY_MESSAGES[risk_levels(np.mean(probs, axis=1))]
@@ -0,0 +1,163 @@
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from risk import DISEASES, FEATURES
+
+STORE_DIR = os.environ.get("HEALTH_RISK_STORE_DIR", ".cache/risk_store")
+SHARDS = 64
+SCAN_ROWS = 1_000_000
+
+# ✅ 컬럼 정의 (컬럼마다 shard 디렉터리 안의 raw 파일 하나, 행 순서 = 추가 순서)
+COLUMNS = {
+    "user": np.uint64,
+    "timestamp": np.float64,
+    "age": np.uint8,
+    **{feature: np.int16 for feature in FEATURES},
+    **{disease: np.float32 for disease in DISEASES},
+}
+
+
+# ✅ 사용자 ID → 64비트 해시 (저장은 해시로만, shard 는 해시 % SHARDS)
+def user_key(user_id):
+    return int.from_bytes(hashlib.blake2b(str(user_id).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ✅ 사용자별 위험도 기록 저장소 (append-only, 컬럼별 파일)
+# - 사용자 해시로 shard 를 나눠 한 사용자 조회는 shard 하나만 훑음
+# - 추가는 컬럼 파일 끝에 이어 쓰기만, 읽기는 np.memmap 으로 SCAN_ROWS 행씩 → 메모리 사용량 일정
+# - 쓰는 도중 종료돼 컬럼 길이가 어긋나면 가장 짧은 컬럼 길이까지만 유효한 행으로 봄
+#   (추가하기 전에 모든 컬럼을 그 길이로 잘라 다음 행부터 다시 맞춤)
+# - 추가는 shard 별 파일 잠금(flock) 안에서 → 여러 프로세스(Streamlit, ingest.py --store)가 함께 써도 행이 어긋나지 않음
+class RiskStore:
+    def __init__(self, directory=STORE_DIR, shards=SHARDS):
+        self.directory = directory
+        self.shards = shards
+        self._lock = threading.Lock()
+
+    def _shard_dir(self, shard):
+        return os.path.join(self.directory, f"shard={shard:03d}")
+
+    def _column_path(self, shard, column):
+        return os.path.join(self._shard_dir(shard), f"{column}.bin")
+
+    # ✅ 여러 행 한 번에 추가 - user_ids (N,), features (N, 6), ages (N,), probs (N, 3), timestamps (N,) 또는 None(현재 시각)
+    def append(self, user_ids, features, ages, probs, timestamps=None):
+        keys = np.array([user_key(user_id) for user_id in user_ids], dtype=np.uint64)
+        features = np.asarray(features).reshape(len(keys), len(FEATURES))
+        probs = np.asarray(probs).reshape(len(keys), len(DISEASES))
+        if timestamps is None:
+            timestamps = np.full(len(keys), time.time())
+        columns = {
+            "user": keys,
+            "timestamp": np.asarray(timestamps, dtype=np.float64).reshape(len(keys)),
+            "age": np.asarray(ages).reshape(len(keys)),
+            **{feature: features[:, i] for i, feature in enumerate(FEATURES)},
+            **{disease: probs[:, i] for i, disease in enumerate(DISEASES)},
+        }
+
+        shard_ids = keys % np.uint64(self.shards)
+        for shard in np.unique(shard_ids):
+            rows = shard_ids == shard
+            with self._shard_lock(int(shard)):
+                self._truncate_torn(int(shard))
+                for column, dtype in COLUMNS.items():
+                    with open(self._column_path(int(shard), column), "ab") as f:
+                        f.write(np.ascontiguousarray(columns[column][rows], dtype=dtype).tobytes())
+        return len(keys)
+
+    @contextlib.contextmanager
+    def _shard_lock(self, shard):
+        os.makedirs(self._shard_dir(shard), exist_ok=True)
+        with self._lock, open(os.path.join(self._shard_dir(shard), ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # 이전 추가가 중간에 끊겨 길이가 다른 컬럼(반쯤 쓴 값 포함)을 가장 짧은 컬럼의 행 수로 자름
+    def _truncate_torn(self, shard):
+        paths = {column: self._column_path(shard, column) for column in COLUMNS}
+        sizes = {column: os.path.getsize(path) if os.path.exists(path) else 0 for column, path in paths.items()}
+        rows = min(sizes[column] // np.dtype(dtype).itemsize for column, dtype in COLUMNS.items())
+        for column, dtype in COLUMNS.items():
+            if sizes[column] > rows * np.dtype(dtype).itemsize:
+                os.truncate(paths[column], rows * np.dtype(dtype).itemsize)
+
+    def record(self, user_id, features, age, probs, timestamp=None):
+        return self.append([user_id], features, [age], probs, None if timestamp is None else [timestamp])
+
+    def _open_shard(self, shard):
+        arrays = {}
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(shard, column)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            rows = size // np.dtype(dtype).itemsize
+            arrays[column] = np.memmap(path, dtype=dtype, mode="r", shape=(rows,)) if rows else np.empty(0, dtype)
+        rows = min(len(array) for array in arrays.values())
+        return {column: array[:rows] for column, array in arrays.items()}
+
+    # ✅ 한 사용자의 기록 (start <= timestamp < end), 시간 순 정렬된 컬럼별 배열 dict
+    def query(self, user_id, start=None, end=None):
+        key = np.uint64(user_key(user_id))
+        arrays = self._open_shard(int(key % np.uint64(self.shards)))
+        users, timestamps = arrays["user"], arrays["timestamp"]
+
+        index = []
+        for offset in range(0, len(users), SCAN_ROWS):
+            mask = users[offset:offset + SCAN_ROWS] == key
+            if start is not None or end is not None:
+                chunk_times = timestamps[offset:offset + SCAN_ROWS]
+                if start is not None:
+                    mask &= chunk_times >= start
+                if end is not None:
+                    mask &= chunk_times < end
+            index.append(np.flatnonzero(mask) + offset)
+        index = np.concatenate(index) if index else np.empty(0, dtype=np.int64)
+
+        result = {column: np.asarray(array[index]) for column, array in arrays.items() if column != "user"}
+        order = np.argsort(result["timestamp"], kind="stable")
+        return {column: values[order] for column, values in result.items()}
+
+    def count(self):
+        return sum(len(self._open_shard(shard)["user"]) for shard in range(self.shards))
+
+
+# ✅ 조회 결과 → 시간 인덱스 DataFrame (추이 차트용)
+def to_frame(records):
+    import pandas as pd
+
+    frame = pd.DataFrame({column: values for column, values in records.items() if column != "timestamp"})
+    frame.index = pd.to_datetime(records["timestamp"], unit="s")
+    frame.index.name = "시간"
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자별 위험도 기록 조회")
+    parser.add_argument("user", nargs="?", help="사용자 ID (생략하면 전체 행 수만 출력)")
+    parser.add_argument("--since", type=float, default=None, help="시작 시각 (epoch 초)")
+    parser.add_argument("--until", type=float, default=None, help="끝 시각 (epoch 초, 미포함)")
+    parser.add_argument("--store", default=STORE_DIR, help="저장소 디렉터리")
+    args = parser.parse_args()
+
+    store = RiskStore(args.store)
+    if args.user is None:
+        print(f"✅ 전체 기록: {store.count()}행")
+        return
+
+    start = time.perf_counter()
+    records = store.query(args.user, args.since, args.until)
+    print(to_frame(records).to_string())
+    print(f"✅ {len(records['timestamp'])}행 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import time
+
+import numpy as np
+
+from model_io import MODEL_PATH, TABLE_SUFFIX, load_predictor, write_source
+from risk import FEATURE_RANGES, FEATURES, MODEL_OUTPUTS, clip_predictions
+
+META_SUFFIX = ".meta.npz"
+
+
+# ✅ 미리 계산한 위험도 표 (트리 모델은 분할 임계값 사이에서 값이 일정하므로 구간 단위로 저장)
+# 표 값은 clip(round(예측, 2), 0, 100)을 100배 한 uint16 → 모델 없이 인덱싱만으로 동일한 결과
+class RiskTable:
+    def __init__(self, table, thresholds, first_cells, ranges):
+        self.table = table
+        self.thresholds = thresholds
+        self.first_cells = first_cells
+        self.ranges = ranges
+
+    @classmethod
+    def load(cls, path):
+        table = np.load(path, mmap_mode="r")
+        with np.load(path + META_SUFFIX, allow_pickle=False) as meta:
+            thresholds = [meta[f"thresholds_{feature}"] for feature in FEATURES]
+            return cls(table, thresholds, meta["first_cells"], meta["ranges"])
+
+    def cell_index(self, features):
+        features = np.asarray(np.atleast_2d(features), dtype=np.float32)
+        low, high = self.ranges[:, 0], self.ranges[:, 1]
+        if ((features < low) | (features > high)).any():
+            raise ValueError("입력값이 위험도 표 범위를 벗어났습니다.")
+        return tuple(
+            np.searchsorted(self.thresholds[f], features[:, f], side="right") - self.first_cells[f]
+            for f in range(len(FEATURES))
+        )
+
+    def predict(self, features):
+        return self.table[self.cell_index(features)] / 100.0
+
+
+# ✅ 특성별 분할 임계값 (xgboost 트리에서 추출)
+def split_thresholds(model_path=MODEL_PATH):
+    import joblib
+
+    from tree_engine import flatten_booster
+
+    arrays = flatten_booster(joblib.load(model_path).get_booster())
+    feature, threshold = arrays["feature"], arrays["threshold"]
+    finite = np.isfinite(threshold)
+    return [np.unique(threshold[finite & (feature == f)]) for f in range(len(FEATURES))]
+
+
+# ✅ 전체 입력 구간에 대해 예측값을 계산해 .npy (mmap) 로 저장
+def build_table(model_path=MODEL_PATH, output_path=None):
+    output_path = output_path or model_path + TABLE_SUFFIX
+    predictor = load_predictor(model_path)
+    thresholds = split_thresholds(model_path)
+    ranges = np.array([FEATURE_RANGES[feature] for feature in FEATURES], dtype=np.float32)
+
+    # 구간마다 대표값 하나 (범위 하한 또는 구간을 시작하는 임계값)
+    first_cells, representatives = [], []
+    for th, (low, high) in zip(thresholds, ranges):
+        first = np.searchsorted(th, low, side="right")
+        last = np.searchsorted(th, high, side="right")
+        first_cells.append(first)
+        representatives.append(np.concatenate([[low], th[first:last]]).astype(np.float32))
+
+    shape = tuple(len(values) for values in representatives) + (len(MODEL_OUTPUTS),)
+    table = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.uint16, shape=shape)
+
+    # 첫 번째 특성(수축기 혈압) 구간마다 나머지 조합을 한 번에 예측 → 메모리 사용량 제한
+    rest = np.stack(np.meshgrid(*representatives[1:], indexing="ij"), axis=-1).reshape(-1, len(FEATURES) - 1)
+    for i, value in enumerate(representatives[0]):
+        features = np.column_stack([np.full(len(rest), value, dtype=np.float32), rest])
+        probs = clip_predictions(predictor.predict(features))
+        table[i] = np.round(probs * 100).astype(np.uint16).reshape(shape[1:])
+    table.flush()
+
+    np.savez(
+        output_path + META_SUFFIX,
+        first_cells=np.asarray(first_cells, dtype=np.int64),
+        ranges=ranges,
+        **{f"thresholds_{feature}": th for feature, th in zip(FEATURES, thresholds)},
+    )
+    write_source(output_path, model_path)
+    return output_path
+
+
+# ✅ 모델 예측값과 비교 (최대 절대 오차)
+def check_table(model_path=MODEL_PATH, table_path=None, rows=100_000, seed=0):
+    table = RiskTable.load(table_path or model_path + TABLE_SUFFIX)
+    predictor = load_predictor(model_path)
+
+    rng = np.random.default_rng(seed)
+    features = np.column_stack([
+        rng.integers(low, high + 1, rows) for low, high in (FEATURE_RANGES[feature] for feature in FEATURES)
+    ])
+    return float(np.abs(clip_predictions(predictor.predict(features)) - table.predict(features)).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 입력 구간 위험도 표 생성")
+    parser.add_argument("--model", default=MODEL_PATH, help="모델 파일 경로")
+    parser.add_argument("--output", default=None, help="출력 경로 (기본: 모델 경로 + .table.npy)")
+    parser.add_argument("--check", action="store_true", help="생성 후 모델 예측값과 비교")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = build_table(args.model, args.output)
+    table = np.load(path, mmap_mode="r")
+    print(f"✅ 저장 완료: {path} {table.shape} ({table.nbytes / 1e6:.0f} MB, {time.perf_counter() - start:.1f}s)")
+
+    if args.check:
+        error = check_table(args.model, path)
+        print(f"✅ 최대 절대 오차: {error:.4f}")
+        if error > 0.01 + 1e-6:
+            raise SystemExit("❌ 모델 예측값과 일치하지 않습니다.")
+
+
+if __name__ == "__main__":
+    main()
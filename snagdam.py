@@ -1,29 +1,24 @@
 import streamlit as st
-from huggingface_hub import InferenceClient
+import os
 import re
 
+from chat_cache import ChatResponseCache
+from chat_history import ASSISTANT, USER, ChatHistory
+from keywords import HEALTH_MATCHER
+from llm_client import create_llm_client
+from metrics import register_collector, timed
+
+HISTORY_PAGE_SIZE = 20
+
 # ✅ 사용자 입력 정제
+REQUEST_PHRASES = re.compile(r"\b(해줘|알려줘|설명해 줘|말해 줘)\b", flags=re.IGNORECASE)
+
 def clean_input(text):
-    text = re.sub(r"\b(해줘|알려줘|설명해 줘|말해 줘)\b", "", text, flags=re.IGNORECASE)
-    return text.strip()
+    return REQUEST_PHRASES.sub("", text).strip()
 
-# ✅ 건강 관련 키워드 판별
+# ✅ 건강 관련 키워드 판별 (매처는 keywords 모듈 import 시 한 번만 생성)
 def is_health_related(text):
-    health_keywords = [
-        "건강", "의학", "의료", "약학", "한의학", "당뇨", "비만", "고지혈증", "고혈압",
-        "운동", "영양", "콜레스테롤", "혈압", "혈당", "체중", "심장", "신장", "식습관",
-        "혈액 검사", "당뇨병", "저혈압", "체질량", "콜레스테롤 수치",
-        "암", "위암", "간암", "대장암", "심장병", "뇌졸중", "심근경색", "협심증", 
-        "치매", "파킨슨병", "우울증", "불안장애", "스트레스", "알츠하이머", "천식",
-        "간경화", "신부전", "위염", "장염", "소화불량", "갑상선", "류마티스", "관절염",
-        "다이어트", "식이요법", "영양소", "칼슘", "철분", "단백질", "비타민", "미네랄",
-        "섭취량", "칼로리", "저염식", "고단백", "채식", "비건", "간헐적 단식",
-        "면역력", "수면", "건강검진", "예방접종", "운동법", "건강개선", "식단",
-        "유산소 운동", "요가", "필라테스", "명상", "호흡법",
-        "혈당 수치", "혈압 수치", "체지방률", "BMI", "콜레스테롤 검사", "간 수치",
-        "신장 기능 검사", "심전도", "빈혈 검사", "질병"
-    ]
-    return any(keyword in text for keyword in health_keywords)
+    return HEALTH_MATCHER.contains(text)
 
 # ✅ 응답에서 질문 제거 및 첫 줄 제거
 def filter_ai_response(response, user_input):
@@ -33,9 +28,73 @@ def filter_ai_response(response, user_input):
         response = "\n".join(response_lines[1:]).strip()
     return response
 
-# ✅ Hugging Face API 토큰
+# ✅ Hugging Face API 토큰 (secrets.toml 이 없으면 환경 변수 사용)
 def get_huggingface_token():
-    return st.secrets.get("HUGGINGFACE_API_TOKEN")
+    try:
+        return st.secrets.get("HUGGINGFACE_API_TOKEN")
+    except FileNotFoundError:
+        return os.environ.get("HUGGINGFACE_API_TOKEN")
+
+# ✅ 프로세스 단위로 공유하는 응답 생성 백엔드 (HEALTH_LLM_BACKEND: remote / local / faq)
+@st.cache_resource
+def get_llm_client():
+    return create_llm_client(token=get_huggingface_token())
+
+# ✅ 비슷한 질문의 이전 응답 캐시 (프로세스 단위 공유, 디스크에 저장)
+@st.cache_resource
+def get_response_cache():
+    cache = ChatResponseCache()
+    register_collector(lambda: {f"chat_cache_{key}": value for key, value in cache.stats().items()})
+    return cache
+
+# ✅ LLM 응답을 토큰 단위로 화면에 표시하고, 정제된 최종 응답 반환 (캐시에 있으면 바로 반환)
+# - 이전 대화를 프롬프트에 넣은 경우(use_cache=False)에는 답변이 대화 흐름에 따라 달라지므로 캐시를 쓰지 않음
+def generate_response(full_prompt, clean_chat, placeholder, use_cache=True):
+    cache = get_response_cache()
+    cached = cache.get(clean_chat) if use_cache else None
+    if cached is not None:
+        return cached
+
+    placeholder.markdown("AI가 응답을 생성 중입니다...")
+    try:
+        client = get_llm_client()
+        raw_response = ""
+        with timed("llm_generation"):
+            for token in client.stream(full_prompt, max_new_tokens=300):
+                raw_response += token
+                placeholder.markdown(raw_response + "▌")
+        # 질문을 되풀이하는 원격 모델 응답만 질문 / 첫 줄 제거 (FAQ / 로컬 모델 응답은 그대로)
+        response = filter_ai_response(raw_response, clean_chat) if client.echoes_prompt else raw_response.strip()
+
+        # ✅ 반복적인 이상 응답 필터링
+        if any(keyword in response for keyword in ["스쿨지어", "스탭스타이저", "가슴과 허벅지", "같은 운동"]):
+            response = "죄송합니다. 질문을 조금 더 구체적으로 입력해 주세요. 다시 안내해드릴게요."
+        elif use_cache:
+            cache.put(clean_chat, response)
+
+    except Exception as e:
+        response = f"⚠️ 오류가 발생했습니다: {e}"
+    return response
+
+# ✅ system prompt 개선
+SYSTEM_PROMPT = (
+    "당신은 건강 전문 상담 AI입니다. "
+    "질병 예방, 운동, 식이요법 등 건강과 관련된 질문에 정확하고 친절하게 답변해주세요. "
+    "너무 반복적인 표현은 피하고, 신뢰할 수 있는 정보를 바탕으로 설명해주세요."
+    " 사용자가 질문한 내용을 바탕으로 답변을 작성해주세요. "
+    "질문에 대한 답변은 간결하고 명확하게 300자넘지 않게 작성해주세요. "
+    "문장은 반드시 완결되도록 끝맺어주세요."
+    "문장은 반드시 공손히 문장을 완성해주세요."
+)
+NOT_HEALTH_RESPONSE = "죄송합니다. 건강 관련 질문만 상담할 수 있습니다."
+
+# ✅ 최근 대화를 토큰 예산 안에서 함께 전달 (HEALTH_CHAT_CONTEXT_TURNS > 0 일 때) → (프롬프트, 이전 대화)
+def build_prompt(clean_chat, history):
+    system_prompt = SYSTEM_PROMPT
+    context = history.context()
+    if context:
+        system_prompt += "\n\n이전 대화:\n" + context
+    return system_prompt + "\n\n질문: " + clean_chat, context
 
 # ✅ 챗봇 실행
 def run_snagdam():
@@ -51,64 +110,49 @@ def run_snagdam():
         '''
     )
 
-    token = get_huggingface_token()
-    client = InferenceClient(
-        model="HuggingFaceH4/zephyr-7b-beta",
-        api_key=token
-    )
-
-    # ✅ 초기 세션 메시지
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-
-    # ✅ 이전 메시지 출력
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    # ✅ 초기 세션 대화 기록 (최근 메시지만 메모리에, 오래된 메시지는 파일로)
+    if "history" not in st.session_state:
+        st.session_state.history = ChatHistory()
+        st.session_state.history_pages = 0
+    history = st.session_state.history
+
+    # ✅ 오래된 메시지: 요약 + 요청한 페이지만 파일에서 읽어 표시
+    if history.archived:
+        st.caption(history.summary())
+        pages = st.session_state.history_pages
+        if pages * HISTORY_PAGE_SIZE < history.archived and st.button("이전 대화 더 보기"):
+            pages = st.session_state.history_pages = pages + 1
+        for page in reversed(range(pages)):
+            for role, content in history.page(page, HISTORY_PAGE_SIZE):
+                with st.chat_message(role):
+                    st.markdown(content)
+
+    # ✅ 최근 메시지 출력 (window 개까지만)
+    for role, content in history.recent:
+        with st.chat_message(role):
+            st.markdown(content)
 
     # ✅ 사용자 입력
     chat = st.chat_input("건강 관련 질문을 입력하세요!")
 
     if chat:
         clean_chat = clean_input(chat)
+        full_prompt = None
 
         if not is_health_related(clean_chat):
-            response = "죄송합니다. 건강 관련 질문만 상담할 수 있습니다."
+            response = NOT_HEALTH_RESPONSE
         else:
-            # ✅ system prompt 개선
-            system_prompt = (
-                "당신은 건강 전문 상담 AI입니다. "
-                "질병 예방, 운동, 식이요법 등 건강과 관련된 질문에 정확하고 친절하게 답변해주세요. "
-                "너무 반복적인 표현은 피하고, 신뢰할 수 있는 정보를 바탕으로 설명해주세요."
-                " 사용자가 질문한 내용을 바탕으로 답변을 작성해주세요. "
-                "질문에 대한 답변은 간결하고 명확하게 300자넘지 않게 작성해주세요. "
-                "문장은 반드시 완결되도록 끝맺어주세요."
-                "문장은 반드시 공손히 문장을 완성해주세요."
-            )
-
-            full_prompt = system_prompt + "\n\n질문: " + clean_chat
+            full_prompt, context = build_prompt(clean_chat, history)
 
             # ✅ 사용자 메시지 저장
-            st.session_state.messages.append({"role": "user", "content": clean_chat})
+            history.append(USER, clean_chat)
             with st.chat_message("user"):
                 st.markdown(clean_chat)
 
-            with st.spinner("AI가 응답을 생성 중입니다..."):
-                try:
-                    raw_response = client.text_generation(
-                        prompt=full_prompt,
-                        max_new_tokens=300
-                    )
-                    response = filter_ai_response(raw_response, clean_chat)
-
-                    # ✅ 반복적인 이상 응답 필터링
-                    if any(keyword in response for keyword in ["스쿨지어", "스탭스타이저", "가슴과 허벅지", "같은 운동"]):
-                        response = "죄송합니다. 질문을 조금 더 구체적으로 입력해 주세요. 다시 안내해드릴게요."
-
-                except Exception as e:
-                    response = f"⚠️ 오류가 발생했습니다: {e}"
-
-        # ✅ AI 응답 저장 및 출력
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        # ✅ AI 응답 생성(스트리밍) · 출력 및 저장
         with st.chat_message("assistant"):
-            st.markdown(response)
+            placeholder = st.empty()
+            if full_prompt is not None:
+                response = generate_response(full_prompt, clean_chat, placeholder, use_cache=not context)
+            placeholder.markdown(response)
+        history.append(ASSISTANT, response)
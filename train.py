@@ -0,0 +1,169 @@
+import argparse
+import json
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from model_io import MODEL_PATH, export_native
+from risk import MODEL_OUTPUTS
+
+# ✅ 학습 입력 / 타깃 컬럼 (건강.ipynb 와 동일한 이름과 순서, 모델 출력도 TARGET_COLUMNS 순서)
+INPUT_COLUMNS = ["수축기혈압", "이완기혈압", "체중(5kg단위)", "신장(5cm단위)", "흡연상태", "음주여부"]
+TARGET_COLUMNS = ["최종_고혈압위험", "최종_당뇨위험", "최종_고지혈증위험", "BMI"]
+# 타깃 컬럼 → 서비스에서 쓰는 출력 이름 (risk.MODEL_OUTPUTS 와 같은 순서여야 함)
+TARGET_LABELS = {"최종_고혈압위험": "고혈압", "최종_당뇨위험": "당뇨병", "최종_고지혈증위험": "고지혈증", "BMI": "BMI"}
+CHUNK_SIZE = 200_000
+BMI_SAMPLES = [[120, 80, 70, 170, 0, 0], [130, 85, 90, 170, 1, 0], [110, 70, 55, 160, 0, 1]]
+BMI_TOLERANCE = 1.5
+
+# ✅ 혈압 구간별 위험 점수 (노트북의 sbp_risk / dbp_risk 함수와 같은 구간)
+SBP_BINS = np.array([120, 130, 140, 160, 180])
+SBP_SCORES = np.array([0, 20, 40, 70, 90, 100], dtype=np.float32)
+DBP_BINS = np.array([80, 85, 90, 95, 100, 110])
+DBP_SCORES = np.array([0, 20, 40, 50, 70, 90, 100], dtype=np.float32)
+
+
+# ✅ 건강검진 CSV를 필요한 컬럼만 float32로 chunk 단위 읽기
+def iter_checkups(path, chunk_size=CHUNK_SIZE, encoding="cp949"):
+    yield from pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=INPUT_COLUMNS,
+        dtype={column: np.float32 for column in INPUT_COLUMNS},
+        chunksize=chunk_size,
+    )
+
+
+# ✅ 특성 엔지니어링 (행 단위 apply 없이 컬럼 연산만 사용)
+def build_features(df):
+    df = df.fillna(0)
+    sbp = df["수축기혈압"].to_numpy()
+    dbp = df["이완기혈압"].to_numpy()
+    weight = df["체중(5kg단위)"].to_numpy()
+    height = df["신장(5cm단위)"].to_numpy()
+
+    bmi = weight / (height / 100) ** 2
+
+    # 연속 점수 (0~100 정규화) + 구간 점수 → 고혈압 위험 점수
+    sbp_score = np.clip((sbp - 120) / (140 - 120) * 100, 0, 100)
+    dbp_score = np.clip((dbp - 80) / (90 - 80) * 100, 0, 100)
+    sbp_risk = SBP_SCORES[np.digitize(sbp, SBP_BINS)]
+    dbp_risk = DBP_SCORES[np.digitize(dbp, DBP_BINS)]
+    bp_score = np.minimum((sbp_score + dbp_score + sbp_risk + dbp_risk) / 4 * 1.2, 100)
+
+    # BMI 기반 위험도
+    bmi_hypertension = np.clip((bmi - 25) / (30 - 25) * 100, 0, 100)
+    bmi_diabetes = np.clip((bmi - 23) / (30 - 23) * 100, 0, 100)
+    bmi_hyperlipidemia = np.clip((bmi - 25) / (30 - 25) * 100, 0, 100)
+
+    # 흡연 / 음주 가중치 (흡연자 20점, 음주자 15점)
+    smoke_risk = np.where(df["흡연상태"].to_numpy() == 1, 20, 0)
+    alco_risk = np.where(df["음주여부"].to_numpy() == 1, 15, 0)
+
+    targets = {
+        "최종_고혈압위험": np.minimum(bp_score * 0.7 + bmi_hypertension * 0.2 + smoke_risk * 0.05 + alco_risk * 0.05, 100),
+        "최종_당뇨위험": np.minimum(bmi_diabetes + smoke_risk * 1.25 + alco_risk * 0.66, 100),
+        "최종_고지혈증위험": np.minimum(bmi_hyperlipidemia + smoke_risk + alco_risk * 1.33, 100),
+        "BMI": bmi,
+    }
+
+    return df[INPUT_COLUMNS], np.column_stack([targets[column] for column in TARGET_COLUMNS]).astype(np.float32)
+
+
+# ✅ CSV 전체 → (X, y)
+def load_training_data(path, chunk_size=CHUNK_SIZE, encoding="cp949"):
+    features, targets = [], []
+    for chunk in iter_checkups(path, chunk_size, encoding):
+        x, y = build_features(chunk)
+        features.append(x)
+        targets.append(y)
+    return pd.concat(features, ignore_index=True), np.concatenate(targets)
+
+
+# ✅ XGBoost 학습 (hist 트리 + 멀티스레드, seed 고정)
+def train_model(features, targets, seed=42, n_estimators=100, n_jobs=-1):
+    from xgboost import XGBRegressor
+
+    model = XGBRegressor(
+        n_estimators=n_estimators,
+        tree_method="hist",
+        n_jobs=n_jobs,
+        random_state=seed,
+    )
+    model.fit(features, targets)
+    return model
+
+
+# ✅ 모델 입력 / 출력이 INPUT_COLUMNS / TARGET_COLUMNS / risk.MODEL_OUTPUTS 와 맞는지 확인 (다르면 ValueError)
+# 학습한 모델은 booster 속성 "targets" 에 타깃 컬럼 이름을 저장해 두고 함께 비교
+def check_model(model):
+    labels = [TARGET_LABELS[column] for column in TARGET_COLUMNS]
+    if labels != MODEL_OUTPUTS:
+        raise ValueError(f"학습 타깃 순서 {labels} 가 서비스 출력 순서 {MODEL_OUTPUTS} 와 다릅니다.")
+    names = list(getattr(model, "feature_names_in_", INPUT_COLUMNS))
+    if names != INPUT_COLUMNS:
+        raise ValueError(f"모델 입력 컬럼이 다릅니다: {names} (필요: {INPUT_COLUMNS})")
+    samples = np.array(BMI_SAMPLES, dtype=np.float32)
+    outputs = np.asarray(model.predict(pd.DataFrame(samples, columns=INPUT_COLUMNS))).reshape(len(samples), -1)
+    if outputs.shape[1] != len(TARGET_COLUMNS):
+        raise ValueError(f"모델 출력 수({outputs.shape[1]})가 타깃 컬럼 수({len(TARGET_COLUMNS)})와 다릅니다.")
+    # BMI 출력 위치가 실제로 BMI 를 예측하는지 확인 (출력 순서가 바뀐 모델을 걸러냄)
+    expected = samples[:, 2] / (samples[:, 3] / 100) ** 2
+    actual = outputs[:, TARGET_COLUMNS.index("BMI")]
+    if np.abs(actual - expected).max() > BMI_TOLERANCE:
+        raise ValueError(f"모델의 BMI 출력({actual.round(2).tolist()})이 실제 BMI({expected.round(2).tolist()})와 다릅니다.")
+    targets = model.get_booster().attr("targets")
+    if targets is not None and json.loads(targets) != TARGET_COLUMNS:
+        raise ValueError(f"모델 타깃 컬럼이 다릅니다: {json.loads(targets)} (필요: {TARGET_COLUMNS})")
+
+
+def main():
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    parser = argparse.ArgumentParser(description="질병 위험 예측 모델 학습")
+    parser.add_argument("data", nargs="?", help="국민건강보험공단 건강검진정보 CSV")
+    parser.add_argument("--check", action="store_true", help="학습하지 않고 --output 모델의 입력 / 출력 컬럼만 확인")
+    parser.add_argument("--output", default=MODEL_PATH, help="모델 저장 경로 (joblib + .ubj)")
+    parser.add_argument("--encoding", default="cp949", help="CSV 인코딩")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="CSV 읽기 chunk 크기")
+    parser.add_argument("--train-size", type=float, default=0.2, help="학습 데이터 비율 (노트북 기본값 0.2)")
+    parser.add_argument("--n-estimators", type=int, default=100, help="트리 개수")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="학습 스레드 수")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    args = parser.parse_args()
+
+    if args.check:
+        check_model(joblib.load(args.output))
+        print(f"✅ 모델 입력 {INPUT_COLUMNS} → 출력 {TARGET_COLUMNS}: {args.output}")
+        return
+    if args.data is None:
+        parser.error("학습 데이터 CSV 경로가 필요합니다.")
+
+    start = time.perf_counter()
+    features, targets = load_training_data(args.data, args.chunk_size, args.encoding)
+    print(f"✅ 데이터 로드: {len(features)}건 ({time.perf_counter() - start:.1f}s)")
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        features, targets, train_size=args.train_size, random_state=args.seed
+    )
+
+    start = time.perf_counter()
+    model = train_model(x_train, y_train, args.seed, args.n_estimators, args.n_jobs)
+    print(f"✅ 학습 완료 ({time.perf_counter() - start:.1f}s)")
+
+    model.get_booster().set_attr(targets=json.dumps(TARGET_COLUMNS, ensure_ascii=False))
+    check_model(model)
+
+    pred = model.predict(x_test)
+    print(f"✅ MAE: {mean_absolute_error(y_test, pred):.4f}, R²: {r2_score(y_test, pred):.4f}")
+
+    joblib.dump(model, args.output)
+    export_native(args.output)
+    print(f"✅ 저장 완료: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
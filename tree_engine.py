@@ -0,0 +1,223 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from model_io import MODEL_PATH, TREE_SUFFIX, write_source
+
+BLOCK_ROWS = 512
+
+
+# ✅ XGBoost 트리 → 완전 이진 트리 형태의 NumPy 배열 (특성 인덱스, 임계값, 결측 방향, 리프 값)
+# 노드 i의 자식은 2i+1 / 2i+2 이므로 자식 포인터 없이 인덱스 계산만으로 내려갈 수 있음
+def flatten_booster(booster):
+    raw = json.loads(booster.save_raw("json"))
+    learner = raw["learner"]
+    model = learner["gradient_booster"]["model"]
+
+    num_target = int(learner["learner_model_param"].get("num_target", 1))
+    base_score = json.loads(learner["learner_model_param"]["base_score"])
+    base_score = np.broadcast_to(np.asarray(base_score, dtype=np.float64), (num_target,)).copy()
+
+    depths = []
+    for tree in model["trees"]:
+        depth = {0: 0}
+        for node, parent in enumerate(tree["parents"][1:], start=1):
+            depth[node] = depth[parent] + 1
+        depths.append(max(depth.values()))
+    max_depth = max(depths)
+
+    num_trees = len(model["trees"])
+    num_nodes = 2 ** max_depth - 1
+    num_leaves = 2 ** max_depth
+    feature = np.zeros((num_trees, num_nodes), dtype=np.int32)
+    threshold = np.full((num_trees, num_nodes), np.inf, dtype=np.float32)
+    default_left = np.ones((num_trees, num_nodes), dtype=bool)
+    leaf = np.zeros((num_trees, num_leaves), dtype=np.float32)
+
+    for t, tree in enumerate(model["trees"]):
+        stack = [(0, 0, 0)]
+        while stack:
+            pos, node, depth = stack.pop()
+            if depth == max_depth:
+                leaf[t, pos - num_nodes] = tree["split_conditions"][node]
+                continue
+            if tree["left_children"][node] == -1:
+                # 얕은 리프는 임계값 +inf(항상 왼쪽)로 두고 같은 리프를 양쪽 자식에 복제
+                stack.append((2 * pos + 1, node, depth + 1))
+                stack.append((2 * pos + 2, node, depth + 1))
+                continue
+            feature[t, pos] = tree["split_indices"][node]
+            threshold[t, pos] = tree["split_conditions"][node]
+            default_left[t, pos] = tree["default_left"][node]
+            stack.append((2 * pos + 1, tree["left_children"][node], depth + 1))
+            stack.append((2 * pos + 2, tree["right_children"][node], depth + 1))
+
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "default_left": default_left,
+        "leaf": leaf,
+        "tree_target": np.asarray(model["tree_info"], dtype=np.int32),
+        "base_score": base_score,
+    }
+
+
+# ✅ 평탄화된 트리 앙상블 예측기 (xgboost 없이 NumPy만 사용)
+class TreeEnsemble:
+    def __init__(self, arrays):
+        self.arrays = arrays
+        num_trees, num_nodes = arrays["feature"].shape
+        self.max_depth = int(np.log2(num_nodes + 1))
+
+        # 모든 트리의 노드를 1차원으로 펼쳐 (트리 시작 위치 + 노드 위치)로 한 번에 조회
+        self.feature = arrays["feature"].ravel()
+        self.threshold = arrays["threshold"].ravel()
+        self.default_left = arrays["default_left"].ravel()
+        self.leaf = arrays["leaf"].ravel()
+        self.node_offsets = np.arange(num_trees, dtype=np.int64) * num_nodes
+        self.leaf_offsets = np.arange(num_trees, dtype=np.int64) * arrays["leaf"].shape[1] - num_nodes
+
+        # 트리별 리프 값을 출력(질병)별로 합치기 위한 (트리 수, 출력 수) 행렬
+        self.base_score = arrays["base_score"]
+        self.target_matrix = np.zeros((num_trees, len(self.base_score)), dtype=np.float64)
+        self.target_matrix[np.arange(num_trees), arrays["tree_target"]] = 1.0
+
+        self.leaf_width = arrays["leaf"].shape[1]
+        self.leaf_starts = np.arange(num_trees, dtype=np.int64) * self.leaf_width
+        self.split_values, self.leaf_masks = (
+            self._build_leaf_masks(arrays) if self.leaf_width <= 64 else (None, None)
+        )
+
+    # ✅ 특성별 "살아남는 리프" 비트마스크 누적표 (QuickScorer 방식)
+    # 값이 임계값 이상이면 그 노드의 왼쪽 서브트리 리프가 전부 탈락 → 임계값 순으로 정렬해 AND 누적
+    # 입력값 x에 대해 searchsorted 한 번으로 해당 특성에서 탈락한 리프 전체를 얻음
+    @staticmethod
+    def _build_leaf_masks(arrays):
+        feature, threshold = arrays["feature"], arrays["threshold"]
+        num_trees, num_nodes = feature.shape
+        max_depth = int(np.log2(num_nodes + 1))
+
+        pos = np.arange(num_nodes)
+        level = np.floor(np.log2(pos + 1)).astype(np.int64)
+        span = 2 ** (max_depth - level)
+        first_leaf = (pos - (2 ** level - 1)) * span
+        left_bits = ((1 << (span // 2)) - 1) << first_leaf
+        keep_masks = np.array([~int(bits) & (2 ** 64 - 1) for bits in left_bits], dtype=np.uint64)
+
+        split_values, leaf_masks = [], []
+        for f in range(int(feature.max()) + 1):
+            trees, nodes = np.nonzero((feature == f) & np.isfinite(threshold))
+            values = threshold[trees, nodes]
+            order = np.argsort(values, kind="stable")
+            trees, nodes, values = trees[order], nodes[order], values[order]
+
+            unique_values, counts = np.unique(values, return_counts=True)
+            table = np.full((len(unique_values) + 1, num_trees), np.uint64(2 ** 64 - 1), dtype=np.uint64)
+            start = 0
+            for k, count in enumerate(counts, start=1):
+                table[k] = table[k - 1]
+                np.bitwise_and.at(table[k], trees[start:start + count], keep_masks[nodes[start:start + count]])
+                start += count
+            split_values.append(unique_values)
+            leaf_masks.append(table)
+        return split_values, leaf_masks
+
+    @classmethod
+    def from_file(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def save(self, path):
+        np.savez(path, **self.arrays)
+
+    def _predict_block(self, features):
+        rows = np.arange(len(features))[:, None]
+        pos = np.zeros((len(features), len(self.node_offsets)), dtype=np.int64)
+
+        # 모든 트리를 깊이 단위로 동시에 한 칸씩 내려감 (오른쪽이면 2i+2, 왼쪽이면 2i+1)
+        for _ in range(self.max_depth):
+            nodes = pos + self.node_offsets
+            values = features[rows, self.feature[nodes]]
+            go_right = np.where(np.isnan(values), ~self.default_left[nodes], values >= self.threshold[nodes])
+            pos = 2 * pos + 1 + go_right
+
+        return self.leaf[pos + self.leaf_offsets] @ self.target_matrix + self.base_score
+
+    def _predict_block_bitvector(self, features):
+        alive = None
+        for f, (values, table) in enumerate(zip(self.split_values, self.leaf_masks)):
+            masks = table[np.searchsorted(values, features[:, f], side="right")]
+            alive = masks if alive is None else alive & masks
+
+        # 가장 왼쪽에 살아남은 리프(최하위 비트)가 실제 도달 리프
+        lowest = alive & (~alive + np.uint64(1))
+        leaf_index = np.frexp(lowest.astype(np.float64))[1] - 1
+        return self.leaf[leaf_index + self.leaf_starts] @ self.target_matrix + self.base_score
+
+    def predict(self, features):
+        features = np.ascontiguousarray(np.atleast_2d(features), dtype=np.float32)
+
+        # 결측값이 없고 트리 깊이가 6 이하이면 비트마스크 방식, 아니면 깊이 단위 탐색
+        predict_block = self._predict_block
+        if self.leaf_masks is not None and not np.isnan(features).any():
+            predict_block = self._predict_block_bitvector
+
+        if len(features) <= BLOCK_ROWS:
+            return predict_block(features)
+        return np.concatenate([
+            predict_block(features[start:start + BLOCK_ROWS])
+            for start in range(0, len(features), BLOCK_ROWS)
+        ])
+
+
+# ✅ 모델 → 트리 배열 파일 (.npz) 변환
+def export_tree_ensemble(model_path=MODEL_PATH, output_path=None):
+    import joblib
+
+    output_path = output_path or model_path + TREE_SUFFIX
+    booster = joblib.load(model_path).get_booster()
+    TreeEnsemble(flatten_booster(booster)).save(output_path)
+    write_source(output_path, model_path)
+    return output_path
+
+
+# ✅ xgboost 예측값과 비교 (최대 절대 오차)
+def check_parity(model_path=MODEL_PATH, tree_path=None, rows=100_000, seed=0):
+    import joblib
+
+    tree_path = tree_path or model_path + TREE_SUFFIX
+    model = joblib.load(model_path)
+    engine = TreeEnsemble.from_file(tree_path)
+
+    rng = np.random.default_rng(seed)
+    features = np.column_stack([
+        rng.integers(50, 201, rows), rng.integers(40, 151, rows),
+        rng.integers(30, 201, rows), rng.integers(120, 251, rows),
+        rng.integers(0, 2, rows), rng.integers(0, 2, rows),
+    ]).astype(np.float32)
+
+    return float(np.abs(model.predict(features) - engine.predict(features)).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XGBoost 모델 → NumPy 트리 배열 변환")
+    parser.add_argument("--model", default=MODEL_PATH, help="pickle 모델 경로")
+    parser.add_argument("--output", default=None, help="출력 경로 (기본: 모델 경로 + .npz)")
+    parser.add_argument("--check", action="store_true", help="변환 후 xgboost 예측값과 비교")
+    args = parser.parse_args()
+
+    path = export_tree_ensemble(args.model, args.output)
+    print(f"✅ 저장 완료: {path}")
+
+    if args.check:
+        start = time.perf_counter()
+        error = check_parity(args.model, path)
+        print(f"✅ 최대 절대 오차: {error:.6f} ({time.perf_counter() - start:.2f}s)")
+        if error > 1e-3:
+            raise SystemExit("❌ xgboost 예측값과 일치하지 않습니다.")
+
+
+if __name__ == "__main__":
+    main()